@@ -0,0 +1,197 @@
+"""
+Endpoint benchmarks for the backend, run against the fake LLM backend.
+
+Drives /api/transform, /api/transform-pdf, /api/train and
+/api/search-characters with synthetic corpora and generated PDFs, and
+reports throughput and p50/p95/p99 latency per endpoint. Every request uses
+fresh input so the result caches do not hide the work being measured.
+
+By default the app is run in-process with LLM_BACKEND=fake, a temporary
+models directory and no LLM rate limits. Use --url to benchmark a running
+server instead (start it with LLM_BACKEND=fake to avoid OpenAI calls).
+
+Usage:
+    python benchmarks/bench_endpoints.py
+    python benchmarks/bench_endpoints.py --requests 200 --concurrency 16 --latency-ms 300
+    python benchmarks/bench_endpoints.py --endpoints transform search --output results.json
+    python benchmarks/bench_endpoints.py --url http://localhost:8000
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = ["transform", "transform-pdf", "train", "search"]
+
+WORDS = (
+    "the a ocean captain bright morning we they run quickly laugh whisper ship harbor "
+    "storm never always friend treasure map island and but so because very just really "
+    "oh well yes indeed splendid terrible wonderful strange old young brave clever"
+).split()
+
+def synthetic_paragraph(rng: random.Random, sentences: int = 5) -> str:
+    result = []
+    for _ in range(sentences):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(6, 18))]
+        result.append(" ".join(words).capitalize() + rng.choice([".", ".", "!", "?"]))
+    return " ".join(result)
+
+def synthetic_corpus(rng: random.Random, paragraphs: int) -> str:
+    return "\n\n".join(synthetic_paragraph(rng) for _ in range(paragraphs))
+
+def synthetic_pdfs(rng: random.Random, count: int, paragraphs: int) -> list[bytes]:
+    """Distinct PDFs rendered with the backend's own PDF generator"""
+    from services.pdf_processor import PDFProcessor
+
+    processor = PDFProcessor()
+    return [
+        processor.generate_pdf(synthetic_corpus(rng, paragraphs)).getvalue()
+        for _ in range(count)
+    ]
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), round(p / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+async def run_scenario(name: str, send, requests: int, concurrency: int) -> dict:
+    """
+    Issue `requests` calls of send(index) with at most `concurrency` in flight.
+
+    Returns:
+        dict: Request/error counts, throughput and latency percentiles (ms)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(index: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await send(index)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "endpoint": name,
+        "requests": requests,
+        "errors": errors,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1)
+    }
+
+def print_results(results: list[dict]):
+    header = f"{'endpoint':<16}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['endpoint']:<16}{r['requests']:>9}{r['errors']:>8}{r['throughput_rps']:>9}"
+              f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}")
+
+async def benchmark(args) -> list[dict]:
+    rng = random.Random(args.seed)
+    app = None
+    sys.path.insert(0, BACKEND_DIR)
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=None)
+    else:
+        # Must be set before the app (and its config) is imported
+        os.environ["LLM_BACKEND"] = "fake"
+        os.environ["FAKE_LLM_LATENCY_MS"] = str(args.latency_ms)
+        os.environ["FAKE_LLM_LATENCY_SIGMA"] = str(args.latency_sigma)
+        os.environ["MODELS_DIR"] = tempfile.mkdtemp(prefix="bench_models_")
+        os.environ.setdefault("LLM_RPM_LIMIT", "0")
+        os.environ.setdefault("LLM_TPM_LIMIT", "0")
+        import main as app
+
+        await app.startup_event()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app.app), base_url="http://bench", timeout=None)
+
+    pdfs = synthetic_pdfs(rng, args.requests, args.pdf_paragraphs) if "transform-pdf" in args.endpoints else []
+    corpora = [synthetic_corpus(rng, args.corpus_paragraphs) for _ in range(args.requests)]
+    texts = [synthetic_paragraph(rng, 3) for _ in range(args.requests)]
+    queries = [f"{rng.choice(WORDS)} {rng.getrandbits(32):08x}" for _ in range(args.requests)]
+
+    try:
+        # A model for the transform endpoints
+        response = await client.post("/api/train", json={"corpus": synthetic_corpus(rng, 20)})
+        response.raise_for_status()
+        response = await client.post("/api/save-model", json={
+            "report_id": response.json()["report_id"],
+            "model_name": f"bench_{int(time.time())}"
+        })
+        response.raise_for_status()
+        model_name = response.json()["model_name"]
+
+        scenarios = {
+            "transform": lambda i: client.post(
+                "/api/transform", json={"model_name": model_name, "text": texts[i]}
+            ),
+            "transform-pdf": lambda i: client.post(
+                "/api/transform-pdf",
+                files={"file": (f"bench_{i}.pdf", pdfs[i], "application/pdf")},
+                data={"model_name": model_name, "output_format": "text"}
+            ),
+            "train": lambda i: client.post("/api/train", json={"corpus": corpora[i]}),
+            "search": lambda i: client.post("/api/search-characters", json={"query": queries[i]})
+        }
+
+        results = []
+        for name in args.endpoints:
+            results.append(await run_scenario(name, scenarios[name], args.requests, args.concurrency))
+
+        await client.delete(f"/api/models/{model_name}")
+        return results
+    finally:
+        await client.aclose()
+        if app is not None:
+            await app.shutdown_event()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backend endpoints against the fake LLM backend")
+    parser.add_argument("--url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=ENDPOINTS)
+    parser.add_argument("--requests", type=int, default=50, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight per endpoint")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Median fake LLM latency (in-process only)")
+    parser.add_argument("--latency-sigma", type=float, default=0.3, help="Log-normal latency spread (in-process only)")
+    parser.add_argument("--pdf-paragraphs", type=int, default=30, help="Paragraphs per generated PDF")
+    parser.add_argument("--corpus-paragraphs", type=int, default=40, help="Paragraphs per training corpus")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = asyncio.run(benchmark(args))
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
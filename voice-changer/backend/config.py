@@ -10,11 +10,51 @@ class Config:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
     MODEL_NAME = os.getenv("MODEL_NAME", "gpt-4o-mini")
     MODELS_DIR = os.getenv("MODELS_DIR", "./models")
+    PDF_TRANSFORM_CONCURRENCY = int(os.getenv("PDF_TRANSFORM_CONCURRENCY", "8"))
+    PDF_PACK_TOKEN_BUDGET = int(os.getenv("PDF_PACK_TOKEN_BUDGET", "2000"))
+    STYLE_REPORT_CACHE_SIZE = int(os.getenv("STYLE_REPORT_CACHE_SIZE", "128"))
+    TRANSFORM_CACHE_MAX_ENTRIES = int(os.getenv("TRANSFORM_CACHE_MAX_ENTRIES", "10000"))
+    TRANSFORM_CACHE_TTL_SECONDS = int(os.getenv("TRANSFORM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    CHECKPOINT_TTL_SECONDS = int(os.getenv("CHECKPOINT_TTL_SECONDS", str(24 * 3600)))
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+    JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "3600"))
+    PDF_PROCESS_WORKERS = int(os.getenv("PDF_PROCESS_WORKERS", "0"))  # 0 = one per CPU core
+    PDF_MAX_FILE_SIZE_MB = int(os.getenv("PDF_MAX_FILE_SIZE_MB", "50"))
+    PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "25"))
+    PDF_EXTRACTION_CACHE_MAX_MB = int(os.getenv("PDF_EXTRACTION_CACHE_MAX_MB", "256"))
+    LEARNER_SHARD_TOKENS = int(os.getenv("LEARNER_SHARD_TOKENS", "60000"))
+    LEARNER_CONCURRENCY = int(os.getenv("LEARNER_CONCURRENCY", "4"))
+    TRAIN_SAMPLE_TOKENS = int(os.getenv("TRAIN_SAMPLE_TOKENS", "20000"))
+    CHARACTER_SEARCH_CACHE_SIZE = int(os.getenv("CHARACTER_SEARCH_CACHE_SIZE", "1000"))
+    CHARACTER_SEARCH_CACHE_TTL_SECONDS = int(os.getenv("CHARACTER_SEARCH_CACHE_TTL_SECONDS", str(24 * 3600)))
+    CHARACTER_SEARCH_MIN_PREFIX = int(os.getenv("CHARACTER_SEARCH_MIN_PREFIX", "3"))
+    CHARACTER_REPORT_TTL_SECONDS = int(os.getenv("CHARACTER_REPORT_TTL_SECONDS", str(30 * 24 * 3600)))
+    LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "500"))  # 0 = unlimited
+    LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "200000"))  # 0 = unlimited
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+    LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "1.0"))
+    LLM_RETRY_MAX_SECONDS = float(os.getenv("LLM_RETRY_MAX_SECONDS", "30.0"))
+    LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+    LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    LLM_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("LLM_KEEPALIVE_EXPIRY_SECONDS", "60"))
+    LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "10"))
+    LLM_READ_TIMEOUT_SECONDS = float(os.getenv("LLM_READ_TIMEOUT_SECONDS", "600"))
+    LLM_HTTP2 = os.getenv("LLM_HTTP2", "false").lower() in ("1", "true", "yes")
+    LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")  # "openai" or "fake"
+    FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "500"))
+    FAKE_LLM_LATENCY_SIGMA = float(os.getenv("FAKE_LLM_LATENCY_SIGMA", "0.3"))
+    FAKE_LLM_MS_PER_TOKEN = float(os.getenv("FAKE_LLM_MS_PER_TOKEN", "0"))
+    FAKE_LLM_REPORT_TOKENS = int(os.getenv("FAKE_LLM_REPORT_TOKENS", "800"))
+    FAKE_LLM_RATE_LIMIT_RATE = float(os.getenv("FAKE_LLM_RATE_LIMIT_RATE", "0"))
+    FAKE_LLM_SEED = int(os.getenv("FAKE_LLM_SEED", "0"))
 
     @classmethod
     def validate(cls):
         """Validate required configuration"""
-        if not cls.OPENAI_API_KEY:
+        if cls.LLM_BACKEND not in ("openai", "fake"):
+            raise ValueError(f"Unknown LLM_BACKEND '{cls.LLM_BACKEND}' (expected 'openai' or 'fake')")
+        if cls.LLM_BACKEND == "openai" and not cls.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY is not set in environment variables")
         return True
 
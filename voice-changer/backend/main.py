@@ -1,17 +1,38 @@
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, PlainTextResponse, JSONResponse, FileResponse
+from starlette.background import BackgroundTask
+from starlette.datastructures import Headers
+from starlette.routing import Match
 from pydantic import BaseModel
 from typing import List, Optional
 import time
+import asyncio
+import json
 from datetime import datetime
 import os
+import tempfile
 
 from config import config
 from services.style_learner import StyleLearner
 from services.style_actor import StyleActor
-from services.pdf_processor import PDFProcessor
+from services.pdf_processor import PDFProcessor, PDFValidationError
+from services.pdf_stream_writer import StreamingPDFWriter
 from services.character_searcher import CharacterSearcher
+from services.corpus_sampler import CorpusSampler
+from services.model_registry import model_registry
+from services.transform_cache import transform_cache
+from services.extraction_cache import extraction_cache
+from services.checkpoint_store import checkpoint_store
+from services.job_queue import job_queue, QueueFullError
+from services.usage_tracker import usage_tracker
+from services.character_search_cache import character_search_cache
+from services.upload_spool import spool_upload, SpooledUpload, UploadTooLargeError
+from services.llm_client import get_llm_client, close_llm_client
+from services.metrics import (
+    registry as metrics_registry, endpoint_label, http_requests, http_request_duration, http_in_flight
+)
+from services.llm_scheduler import llm_scheduler, llm_priority, PRIORITY_PREVIEW, PRIORITY_BULK
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -20,7 +41,79 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# Configure CORS
+# Room for the multipart boundaries and the form fields sent next to the file
+UPLOAD_FORM_OVERHEAD_BYTES = 64 * 1024
+
+class UploadSizeLimitMiddleware:
+    """
+    Cut off multipart uploads as soon as their body crosses the PDF size limit.
+
+    Requests declaring a larger Content-Length are refused before any of the
+    body is read; other uploads are aborted mid-stream once the limit is
+    crossed, before the form parser spools the rest of the file to disk.
+    """
+
+    def __init__(self, app, max_body_bytes: int):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope, receive, send):
+        headers = Headers(scope=scope) if scope["type"] == "http" else None
+        if headers is None or not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"File exceeds {config.PDF_MAX_FILE_SIZE_MB}MB limit"
+        declared = headers.get("content-length", "")
+        if declared.isdigit() and int(declared) > self.max_body_bytes:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+# Registered before the metrics middleware so that it runs inside it: aborted
+# uploads are still counted, and the 413 is raised straight into the form parser
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_body_bytes=config.PDF_MAX_FILE_SIZE_MB * 1024 * 1024 + UPLOAD_FORM_OVERHEAD_BYTES
+)
+
+def _route_template(scope) -> str:
+    """Path template of the matched route (e.g. /api/jobs/{job_id}), to keep metric labels bounded"""
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+@app.middleware("http")
+async def record_request_metrics(request, call_next):
+    """Label everything done for a request with its endpoint and record request metrics"""
+    endpoint = _route_template(request.scope)
+    started = time.perf_counter()
+    status = 500
+    with endpoint_label(endpoint), http_in_flight.track(endpoint=endpoint):
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            http_request_duration.observe(time.perf_counter() - started, endpoint=endpoint, method=request.method)
+            http_requests.inc(endpoint=endpoint, method=request.method, status=status)
+
+# Configure CORS (registered last so it is the outermost middleware and every
+# response, including the upload limiter's 413s, carries the CORS headers)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # In production, specify your frontend URL
@@ -29,11 +122,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize services
-style_learner = StyleLearner()
-style_actor = StyleActor()
-pdf_processor = PDFProcessor(max_file_size_mb=10)
-character_searcher = CharacterSearcher()
+# Initialize services (sharing one pooled OpenAI client)
+llm_client = get_llm_client()
+style_learner = StyleLearner(client=llm_client)
+style_actor = StyleActor(client=llm_client)
+pdf_processor = PDFProcessor(
+    max_file_size_mb=config.PDF_MAX_FILE_SIZE_MB,
+    max_workers=config.PDF_PROCESS_WORKERS,
+    pages_per_task=config.PDF_PAGES_PER_TASK
+)
+character_searcher = CharacterSearcher(client=llm_client)
+corpus_sampler = CorpusSampler(token_budget=config.TRAIN_SAMPLE_TOKENS)
 
 # Request/Response Models
 class TrainRequest(BaseModel):
@@ -43,6 +142,7 @@ class TrainResponse(BaseModel):
     success: bool
     report_id: str
     message: str
+    sampling: Optional[dict] = None
 
 class SaveModelRequest(BaseModel):
     report_id: str
@@ -103,6 +203,10 @@ class CharacterPreviewResponse(BaseModel):
     report_id: str
     examples: List[str]
 
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    status: str
+
 # API Endpoints
 
 @app.get("/")
@@ -133,13 +237,15 @@ async def train(request: TrainRequest):
                 detail="Corpus must be at least 50 characters long"
             )
 
-        # Analyze the corpus
-        report_id, style_report = style_learner.analyze_corpus(request.corpus)
+        # Select a representative, token-budgeted sample, then analyze it
+        sampled = await asyncio.to_thread(corpus_sampler.sample, request.corpus)
+        report_id, style_report = await style_learner.analyze_corpus(sampled["text"])
 
         return TrainResponse(
             success=True,
             report_id=report_id,
-            message="Style analysis complete"
+            message="Style analysis complete",
+            sampling=sampled["stats"]
         )
 
     except Exception as e:
@@ -159,7 +265,7 @@ async def search_characters(request: SearchCharactersRequest):
             )
 
         # Search for characters
-        characters = character_searcher.search_characters(request.query.strip())
+        characters = await character_searcher.search_characters(request.query.strip())
 
         return SearchCharactersResponse(
             characters=[Character(**char) for char in characters],
@@ -183,7 +289,7 @@ async def train_from_character(request: TrainFromCharacterRequest):
             )
 
         # Generate style report from character
-        report_id, style_report = style_learner.analyze_character(
+        report_id, style_report = await style_learner.analyze_character(
             request.name,
             request.description,
             request.source
@@ -235,12 +341,18 @@ async def save_model(request: SaveModelRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/models", response_model=List[ModelInfo])
-async def list_models():
+async def list_models(offset: int = 0, limit: Optional[int] = None):
     """
     List all available trained models.
+
+    Served from the model registry (reconciled with the models directory on
+    each call); use offset/limit to page through large lists.
     """
     try:
-        models = style_actor.list_models()
+        if offset < 0 or (limit is not None and limit < 0):
+            raise HTTPException(status_code=400, detail="offset and limit must be non-negative")
+
+        models = await asyncio.to_thread(style_actor.list_models, offset=offset, limit=limit)
 
         # Format the response
         formatted_models = []
@@ -253,6 +365,8 @@ async def list_models():
 
         return formatted_models
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -290,10 +404,12 @@ async def training_examples(request: TrainingExamplesRequest):
 
         prompts = request.prompts if request.prompts and len(request.prompts) > 0 else DEFAULT_PREVIEW_PROMPTS
 
-        examples: List[str] = []
-        for prompt in prompts[:3]:  # ensure max 3
-            transformed = style_actor.transform_with_style_report(style_report, prompt)
-            examples.append(transformed)
+        # Run the example transforms concurrently (max 3)
+        with llm_priority(PRIORITY_PREVIEW):
+            examples: List[str] = await asyncio.gather(*(
+                style_actor.transform_with_style_report(style_report, prompt)
+                for prompt in prompts[:3]
+            ))
 
         return TrainingExamplesResponse(examples=examples)
 
@@ -314,18 +430,20 @@ async def character_preview(request: CharacterPreviewRequest):
             raise HTTPException(status_code=400, detail="Character name cannot be empty")
 
         # Analyze character (saves a temporary report and returns content)
-        report_id, style_report = style_learner.analyze_character(
-            request.name,
-            request.description,
-            request.source
-        )
+        with llm_priority(PRIORITY_PREVIEW):
+            report_id, style_report = await style_learner.analyze_character(
+                request.name,
+                request.description,
+                request.source
+            )
 
         prompts = request.prompts if request.prompts and len(request.prompts) > 0 else DEFAULT_PREVIEW_PROMPTS
 
-        examples: List[str] = []
-        for prompt in prompts[:3]:
-            transformed = style_actor.transform_with_style_report(style_report, prompt)
-            examples.append(transformed)
+        with llm_priority(PRIORITY_PREVIEW):
+            examples: List[str] = await asyncio.gather(*(
+                style_actor.transform_with_style_report(style_report, prompt)
+                for prompt in prompts[:3]
+            ))
 
         return CharacterPreviewResponse(report_id=report_id, examples=examples)
 
@@ -354,7 +472,7 @@ async def transform(request: TransformRequest):
             )
 
         # Transform the text
-        transformed_text = style_actor.transform_text(
+        transformed_text = await style_actor.transform_text(
             request.model_name,
             request.text
         )
@@ -366,6 +484,58 @@ async def transform(request: TransformRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sse_event(data: dict, event: Optional[str] = None) -> str:
+    """Format a Server-Sent Events message"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+@app.post("/api/transform-stream")
+async def transform_stream(request: TransformRequest):
+    """
+    Transform text using a trained style model, streaming the result as
+    Server-Sent Events.
+
+    Emits `data: {"delta": "..."}` messages as text is generated, then a final
+    `event: done` message carrying the full transformed text (or `event: error`).
+    """
+    if not request.text or len(request.text.strip()) == 0:
+        raise HTTPException(
+            status_code=400,
+            detail="Input text cannot be empty"
+        )
+
+    if not request.model_name:
+        raise HTTPException(
+            status_code=400,
+            detail="Model name is required"
+        )
+
+    try:
+        deltas = await style_actor.stream_transform_text(
+            request.model_name,
+            request.text
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def event_stream():
+        chunks = []
+        try:
+            async for delta in deltas:
+                chunks.append(delta)
+                yield _sse_event({"delta": delta})
+            yield _sse_event({"transformed_text": "".join(chunks).strip()}, event="done")
+        except Exception as e:
+            yield _sse_event({"detail": str(e)}, event="error")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.delete("/api/models/{model_name}", response_model=DeleteResponse)
 async def delete_model(model_name: str):
     """
@@ -385,29 +555,60 @@ async def delete_model(model_name: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/cache-stats")
+async def cache_stats():
+    """
+    Hit/miss counters for the transform result cache, the character search
+    cache and the PDF extraction cache.
+    """
+    return {
+        **transform_cache.stats(),
+        "character_search": character_search_cache.stats(),
+        "pdf_extraction": extraction_cache.stats()
+    }
+
+@app.get("/api/usage-stats")
+async def usage_stats():
+    """
+    LLM token usage per operation and model, split into cached and uncached
+    input tokens so prompt cache effectiveness can be checked.
+    """
+    return {"usage": usage_tracker.stats()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus metrics: request, LLM call, token, queue, PDF stage, style
+    report load and cache metrics, labeled by endpoint and model.
+    """
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/scheduler-stats")
+async def scheduler_stats():
+    """
+    Outbound LLM scheduler state: queued calls and queue time per priority
+    class, retry counters and the configured rate limits.
+    """
+    return llm_scheduler.stats()
+
 # PDF Endpoints
 
 @app.post("/api/extract-pdf")
-async def extract_pdf(file: UploadFile = File(...)):
+async def extract_pdf(file: Optional[UploadFile] = File(None), document_hash: Optional[str] = Form(None)):
     """
     Extract text from a PDF file
+
+    The returned document_hash can be sent to the other PDF endpoints instead
+    of uploading the same file again.
     """
     try:
-        # Read file content
-        content = await file.read()
-
-        # Validate PDF
-        validation = pdf_processor.validate_pdf(content)
-        if not validation["valid"]:
-            raise HTTPException(status_code=400, detail=validation["error"])
-
-        # Extract text
-        result = pdf_processor.extract_text_with_structure(content)
+        document_hash, result = await _load_pdf(file, document_hash)
 
         return {
             "text": result["text"],
             "pages": result["pages"],
             "paragraph_count": len(result["paragraphs"]),
+            "document_hash": document_hash,
             "success": True
         }
 
@@ -416,49 +617,279 @@ async def extract_pdf(file: UploadFile = File(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to process PDF: {str(e)}")
 
+async def _spool_pdf_upload(file: UploadFile) -> SpooledUpload:
+    """Stream an uploaded PDF to a temporary file, rejecting it as soon as it crosses the size limit"""
+    try:
+        return await spool_upload(file, pdf_processor.max_file_size_bytes)
+    except UploadTooLargeError:
+        raise HTTPException(status_code=413, detail=f"File exceeds {pdf_processor.max_file_size_mb}MB limit")
+
+async def _receive_pdf(
+    file: Optional[UploadFile],
+    document_hash: Optional[str]
+) -> tuple[Optional[SpooledUpload], str]:
+    """
+    Spool an uploaded PDF, or resolve a reference to a previously uploaded one.
+
+    Returns:
+        tuple: (upload, document hash); upload is None when the document was
+            referenced by hash, otherwise the caller must close it
+    """
+    if file is not None:
+        upload = await _spool_pdf_upload(file)
+        return upload, upload.sha256
+
+    if not document_hash:
+        raise HTTPException(status_code=400, detail="Send a PDF file or the document_hash of a previously uploaded PDF")
+    if not await asyncio.to_thread(extraction_cache.contains, document_hash):
+        raise HTTPException(status_code=404, detail=f"Document '{document_hash}' is not cached; upload the PDF again")
+    return None, document_hash
+
+async def _extract_pdf_content(document_hash: str, upload: Optional[SpooledUpload]) -> dict:
+    """
+    Validated extraction of a PDF, from the extraction cache when possible.
+
+    On a miss the spooled upload is validated and extracted in the PDF
+    process pool and the result is cached under its hash.
+    """
+    result = await asyncio.to_thread(extraction_cache.get, document_hash)
+    if result is not None:
+        return result
+
+    if upload is None:
+        raise HTTPException(status_code=404, detail=f"Document '{document_hash}' is not cached; upload the PDF again")
+
+    result = await pdf_processor.process_pdf_file_async(upload.path)
+    if not result["valid"]:
+        raise HTTPException(status_code=400, detail=result["error"])
+
+    await asyncio.to_thread(extraction_cache.put, document_hash, result)
+    return result
+
+async def _load_pdf(file: Optional[UploadFile], document_hash: Optional[str]) -> tuple[str, dict]:
+    """
+    Receive and extract a PDF sent as a file or referenced by hash.
+
+    Returns:
+        tuple: (document hash, extraction result)
+    """
+    upload, document_hash = await _receive_pdf(file, document_hash)
+    try:
+        return document_hash, await _extract_pdf_content(document_hash, upload)
+    finally:
+        if upload is not None:
+            upload.close()
+
+async def _transform_pdf_content(
+    result: dict,
+    document_hash: str,
+    model_name: str,
+    pack_paragraphs: bool = False,
+    on_progress=None
+) -> dict:
+    """
+    Transform the paragraphs of an extracted PDF.
+
+    Returns:
+        dict: {"transformed_text": str, "pages": int, "resumed": int}
+    """
+    # Transform paragraphs concurrently (bounded by PDF_TRANSFORM_CONCURRENCY)
+    with llm_priority(PRIORITY_BULK):
+        document = await style_actor.transform_document(
+            model_name,
+            result["paragraphs"],
+            document_hash,
+            pack_paragraphs=pack_paragraphs,
+            on_progress=on_progress
+        )
+
+    return {
+        "transformed_text": "\n\n".join(document["paragraphs"]),
+        "pages": result["pages"],
+        "resumed": document["resumed"]
+    }
+
+async def _train_pdf_content(result: dict) -> TrainResponse:
+    """Analyze the text of an extracted PDF as a training corpus"""
+    # Train with a representative sample of the extracted text
+    sampled = await asyncio.to_thread(corpus_sampler.sample, result["text"])
+    with llm_priority(PRIORITY_BULK):
+        report_id, style_report = await style_learner.analyze_corpus(sampled["text"])
+
+    return TrainResponse(
+        success=True,
+        report_id=report_id,
+        message=f"Style analysis complete ({result['pages']} pages processed)",
+        sampling=sampled["stats"]
+    )
+
+async def _render_pdf_file(transformed_text: str) -> str:
+    """Render transformed text in the PDF process pool straight to a new temporary file"""
+    fd, pdf_path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    try:
+        await pdf_processor.generate_pdf_async(transformed_text, output_path=pdf_path)
+    except BaseException:
+        os.unlink(pdf_path)
+        raise
+    return pdf_path
+
+def _pdf_file_response(pdf_path: str, document_hash: str, background: BackgroundTask | None = None) -> FileResponse:
+    """Stream a rendered PDF file back as a download"""
+    return FileResponse(
+        pdf_path,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": "attachment; filename=transformed.pdf",
+            "X-Document-Hash": document_hash
+        },
+        background=background
+    )
+
+async def _transformed_pdf_response(transformed_text: str, document_hash: str) -> FileResponse:
+    """
+    Render transformed text as a downloadable PDF.
+
+    The PDF is rendered to a temporary file, which is streamed back in chunks
+    and removed once the response is sent.
+    """
+    pdf_path = await _render_pdf_file(transformed_text)
+    return _pdf_file_response(pdf_path, document_hash, background=BackgroundTask(os.unlink, pdf_path))
+
+async def _cached_paragraph_chunks(paragraphs: List[str]):
+    """Paragraphs of an already extracted document, as a single pipeline chunk"""
+    yield paragraphs
+
+async def _pipelined_pdf_response(
+    upload: Optional[SpooledUpload],
+    document_hash: str,
+    model_name: str
+) -> StreamingResponse:
+    """
+    Extract, transform and render a PDF as a pipeline, streaming the output.
+
+    Paragraphs are sent for transformation as soon as their page range is
+    extracted, and transformed paragraphs are written to an incremental PDF
+    writer whose finished pages are streamed to the client in document order.
+    Documents in the extraction cache skip extraction. Takes ownership of
+    the upload, which is removed once the response ends (sent or failed).
+    """
+    def close_upload():
+        if upload is not None:
+            upload.close()
+
+    try:
+        if not style_actor.has_model(model_name):
+            raise HTTPException(status_code=404, detail=f"Model '{model_name}' not found")
+
+        cached = await asyncio.to_thread(extraction_cache.get, document_hash)
+        if cached is not None:
+            chunks = _cached_paragraph_chunks(cached["paragraphs"])
+        elif upload is not None:
+            chunks = pdf_processor.iter_paragraph_chunks_async(upload.path)
+        else:
+            raise HTTPException(status_code=404, detail=f"Document '{document_hash}' is not cached; upload the PDF again")
+
+        # Validate on the first page range before the response starts
+        first_chunk = await anext(chunks)
+    except PDFValidationError as e:
+        close_upload()
+        raise HTTPException(status_code=400, detail=str(e))
+    except BaseException:
+        close_upload()
+        raise
+
+    semaphore = asyncio.Semaphore(max(1, config.PDF_TRANSFORM_CONCURRENCY))
+    tasks: List[asyncio.Task] = []
+    pending: asyncio.Queue = asyncio.Queue()
+
+    async def transform_chunk(paragraphs: List[str]) -> List[str]:
+        with llm_priority(PRIORITY_BULK):
+            return await style_actor.transform_paragraphs(model_name, paragraphs, semaphore=semaphore)
+
+    def schedule(paragraphs: List[str]):
+        task = asyncio.create_task(transform_chunk(paragraphs))
+        tasks.append(task)
+        pending.put_nowait(task)
+
+    async def extract_remaining():
+        try:
+            async for paragraphs in chunks:
+                schedule(paragraphs)
+        finally:
+            pending.put_nowait(None)
+
+    async def render():
+        schedule(first_chunk)
+        extractor = asyncio.create_task(extract_remaining())
+        writer = StreamingPDFWriter()
+        try:
+            while (task := await pending.get()) is not None:
+                for paragraph in await task:
+                    data = writer.add_paragraph(paragraph)
+                    if data:
+                        yield data
+            await extractor  # surface extraction errors
+            yield writer.close()
+        finally:
+            extractor.cancel()
+            for task in tasks:
+                task.cancel()
+            # Background tasks are skipped when the body raises, so do not rely on them alone
+            close_upload()
+
+    return StreamingResponse(
+        render(),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": "attachment; filename=transformed.pdf",
+            "X-Document-Hash": document_hash
+        },
+        background=BackgroundTask(close_upload)
+    )
+
 @app.post("/api/transform-pdf")
 async def transform_pdf(
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
+    document_hash: Optional[str] = Form(None),
     model_name: str = Form(...),
-    output_format: str = Form("text")
+    output_format: str = Form("text"),
+    pack_paragraphs: bool = Form(False),
+    pipeline: bool = Form(False)
 ):
     """
     Transform PDF content using a trained model
 
     output_format: "text" or "pdf"
+    pack_paragraphs: send several paragraphs per LLM request (PDF_PACK_TOKEN_BUDGET)
+    pipeline: with output_format "pdf", overlap extraction, transformation and
+        rendering and stream the PDF as pages are finished (no checkpointing)
+
+    Send either the PDF file or the document_hash of a previously uploaded
+    PDF. Finished paragraphs are checkpointed per (document hash, model);
+    re-sending the same PDF after a failure only transforms the missing
+    paragraphs.
     """
+    checkpointing = False
     try:
-        # Read and validate PDF
-        content = await file.read()
-        validation = pdf_processor.validate_pdf(content)
-        if not validation["valid"]:
-            raise HTTPException(status_code=400, detail=validation["error"])
+        if pipeline and output_format == "pdf":
+            upload, document_hash = await _receive_pdf(file, document_hash)
+            return await _pipelined_pdf_response(upload, document_hash, model_name)
 
-        # Extract text
-        result = pdf_processor.extract_text_with_structure(content)
-
-        # Transform each paragraph
-        transformed_paragraphs = []
-        for paragraph in result["paragraphs"]:
-            transformed = style_actor.transform_text(model_name, paragraph)
-            transformed_paragraphs.append(transformed)
-
-        transformed_text = "\n\n".join(transformed_paragraphs)
+        document_hash, extraction = await _load_pdf(file, document_hash)
+        checkpointing = True
+        result = await _transform_pdf_content(extraction, document_hash, model_name, pack_paragraphs)
 
         # Return based on output format
         if output_format == "pdf":
-            # Generate PDF
-            pdf_buffer = pdf_processor.generate_pdf(transformed_text)
-            return StreamingResponse(
-                pdf_buffer,
-                media_type="application/pdf",
-                headers={"Content-Disposition": "attachment; filename=transformed.pdf"}
-            )
+            return await _transformed_pdf_response(result["transformed_text"], document_hash)
         else:
             # Return as text
             return {
-                "transformed_text": transformed_text,
+                "transformed_text": result["transformed_text"],
                 "pages_processed": result["pages"],
+                "document_hash": document_hash,
+                "resumed_paragraphs": result["resumed"],
                 "success": True
             }
 
@@ -467,50 +898,191 @@ async def transform_pdf(
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to transform PDF: {str(e)}")
+        detail = f"Failed to transform PDF: {str(e)}"
+        if checkpointing:
+            detail += f" (progress saved; retry to resume, document_hash={document_hash})"
+        raise HTTPException(status_code=500, detail=detail)
 
-@app.post("/api/train-pdf")
-async def train_pdf(file: UploadFile = File(...)):
-    """
-    Train a model using PDF as corpus
+@app.get("/api/transform-pdf/checkpoint")
+async def transform_pdf_checkpoint(document_hash: str, model_name: str):
     """
-    try:
-        # Read and validate PDF
-        content = await file.read()
-        validation = pdf_processor.validate_pdf(content)
-        if not validation["valid"]:
-            raise HTTPException(status_code=400, detail=validation["error"])
+    Fetch the (possibly partial) results of a checkpointed PDF transform.
 
-        # Extract text
-        result = pdf_processor.extract_text_with_structure(content)
+    Paragraphs that have not been transformed yet are returned as null.
+    """
+    checkpoint = await asyncio.to_thread(checkpoint_store.get, document_hash, model_name)
+    if checkpoint is None:
+        raise HTTPException(status_code=404, detail="No checkpoint found for this document and model")
 
-        # Train with extracted text
-        report_id, style_report = style_learner.analyze_corpus(result["text"])
+    return {
+        "document_hash": document_hash,
+        "model_name": model_name,
+        "total": checkpoint["total"],
+        "completed": checkpoint["completed"],
+        "paragraphs": checkpoint["paragraphs"],
+        "complete": checkpoint["completed"] >= checkpoint["total"]
+    }
 
-        return TrainResponse(
-            success=True,
-            report_id=report_id,
-            message=f"Style analysis complete ({result['pages']} pages processed)"
-        )
+@app.post("/api/train-pdf")
+async def train_pdf(file: Optional[UploadFile] = File(None), document_hash: Optional[str] = Form(None)):
+    """
+    Train a model using PDF as corpus (sent as a file or referenced by document_hash)
+    """
+    try:
+        document_hash, extraction = await _load_pdf(file, document_hash)
+        return await _train_pdf_content(extraction)
 
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to train from PDF: {str(e)}")
 
+# Background job endpoints
+
+def _submit_job(kind: str, handler, upload: SpooledUpload | None = None) -> JobSubmitResponse:
+    """Queue a job; the upload it will process (if any) is removed when the job is rejected"""
+    try:
+        job = job_queue.submit(kind, handler)
+    except QueueFullError as e:
+        if upload is not None:
+            upload.close()
+        raise HTTPException(status_code=503, detail=str(e))
+    return JobSubmitResponse(job_id=job.id, status=job.status)
+
+@app.post("/api/jobs/transform-pdf", response_model=JobSubmitResponse)
+async def submit_transform_pdf_job(
+    file: Optional[UploadFile] = File(None),
+    document_hash: Optional[str] = Form(None),
+    model_name: str = Form(...),
+    output_format: str = Form("text"),
+    pack_paragraphs: bool = Form(False)
+):
+    """
+    Queue a PDF transform and return a job id immediately.
+
+    Poll GET /api/jobs/{job_id} for progress and fetch the output from
+    GET /api/jobs/{job_id}/result.
+    """
+    # Oversized files and unknown hashes are rejected before queueing
+    upload, document_hash = await _receive_pdf(file, document_hash)
+
+    async def run(job):
+        try:
+            extraction = await _extract_pdf_content(document_hash, upload)
+        finally:
+            if upload is not None:
+                upload.close()
+        result = await _transform_pdf_content(
+            extraction,
+            document_hash,
+            model_name,
+            pack_paragraphs,
+            on_progress=job.set_progress
+        )
+        if output_format == "pdf":
+            # Kept on disk (not in the job) until the job is pruned
+            result["pdf_path"] = await _render_pdf_file(result["transformed_text"])
+            job.files.append(result["pdf_path"])
+        result["document_hash"] = document_hash
+        return result
+
+    return _submit_job("transform-pdf", run, upload)
+
+@app.post("/api/jobs/train-pdf", response_model=JobSubmitResponse)
+async def submit_train_pdf_job(file: Optional[UploadFile] = File(None), document_hash: Optional[str] = Form(None)):
+    """
+    Queue training from a PDF corpus (sent as a file or referenced by
+    document_hash) and return a job id immediately.
+    """
+    # Oversized files and unknown hashes are rejected before queueing
+    upload, document_hash = await _receive_pdf(file, document_hash)
+
+    async def run(job):
+        try:
+            extraction = await _extract_pdf_content(document_hash, upload)
+        finally:
+            if upload is not None:
+                upload.close()
+        return await _train_pdf_content(extraction)
+
+    return _submit_job("train-pdf", run, upload)
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Get the status and progress (paragraphs done/total) of a background job.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job.to_dict()
+
+@app.get("/api/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """
+    Download the result of a completed background job.
+
+    Transform jobs return the same body as /api/transform-pdf (JSON or PDF);
+    train jobs return the same body as /api/train-pdf.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+
+    if job.kind == "train-pdf":
+        return job.result
+
+    result = job.result
+    if "pdf_path" in result:
+        return _pdf_file_response(result["pdf_path"], result["document_hash"])
+
+    return {
+        "transformed_text": result["transformed_text"],
+        "pages_processed": result["pages"],
+        "document_hash": result["document_hash"],
+        "resumed_paragraphs": result["resumed"],
+        "success": True
+    }
+
+@app.get("/api/jobs")
+async def job_stats():
+    """
+    Job queue depth, worker count and job counts by status.
+    """
+    return job_queue.stats()
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
-    """Validate configuration on startup"""
+    """Validate configuration and rebuild the model registry on startup"""
     try:
         config.validate()
         print("✓ Configuration validated")
         print(f"✓ Using model: {config.MODEL_NAME}")
+        if config.LLM_BACKEND == "fake":
+            print("✓ Using the fake LLM backend (no OpenAI calls)")
         print(f"✓ Models directory: {config.MODELS_DIR}")
     except ValueError as e:
         print(f"✗ Configuration error: {e}")
         print("Please set OPENAI_API_KEY in your .env file")
 
+    model_count = model_registry.rebuild()
+    print(f"✓ Indexed {model_count} models")
+
+    job_queue.start()
+    print(f"✓ Started {job_queue.workers} job workers")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background job workers, PDF worker processes and LLM connections"""
+    await job_queue.stop()
+    pdf_processor.shutdown()
+    await close_llm_client()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,107 @@
+import os
+import time
+import sqlite3
+from threading import Lock
+from config import config
+from services.character_search_cache import normalize_query
+from services.metrics import cache_lookups, current_labels
+
+CHARACTER_REPORT_FILENAME = "character_reports.sqlite3"
+
+class CharacterReportStore:
+    """
+    Generated character style reports, keyed by normalized (name, source).
+
+    Each key holds the latest report plus a version number that increases
+    every time the report is regenerated. A stored report is only reused
+    while it is younger than `ttl_seconds` and was produced with the same
+    generator fingerprint (LLM model and prompt version).
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: int = 30 * 24 * 3600):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self._conn = None
+        self._lock = Lock()
+
+    def get(self, name: str, source: str, fingerprint: str) -> dict | None:
+        """
+        Look up a reusable report for a character.
+
+        Args:
+            name: Character name, as entered
+            source: Source work/franchise, as entered
+            fingerprint: Identifies how the report would be generated now
+
+        Returns:
+            dict or None: {"style_report", "version", "created_at"}, or None
+                when there is no fresh report for the current fingerprint
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT style_report, version, fingerprint, created_at FROM character_reports "
+                "WHERE name_key = ? AND source_key = ?",
+                self._key(name, source)
+            ).fetchone()
+
+        if row is None:
+            cache_lookups.inc(cache="character_report", result="miss", **current_labels())
+            return None
+
+        style_report, version, stored_fingerprint, created_at = row
+        if stored_fingerprint != fingerprint or created_at < time.time() - self.ttl_seconds:
+            cache_lookups.inc(cache="character_report", result="stale", **current_labels())
+            return None
+
+        cache_lookups.inc(cache="character_report", result="hit", **current_labels())
+        return {"style_report": style_report, "version": version, "created_at": created_at}
+
+    def put(self, name: str, source: str, fingerprint: str, style_report: str) -> int:
+        """
+        Store a newly generated report, replacing the previous version.
+
+        Returns:
+            int: The report's version number
+        """
+        name_key, source_key = self._key(name, source)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO character_reports "
+                "(name_key, source_key, style_report, version, fingerprint, created_at) "
+                "VALUES (?, ?, ?, 1, ?, ?) "
+                "ON CONFLICT (name_key, source_key) DO UPDATE SET "
+                "style_report = excluded.style_report, version = version + 1, "
+                "fingerprint = excluded.fingerprint, created_at = excluded.created_at",
+                (name_key, source_key, style_report, fingerprint, time.time())
+            )
+            conn.commit()
+            row = conn.execute(
+                "SELECT version FROM character_reports WHERE name_key = ? AND source_key = ?",
+                (name_key, source_key)
+            ).fetchone()
+        return row[0]
+
+    def _key(self, name: str, source: str) -> tuple[str, str]:
+        return normalize_query(name), normalize_query(source or "")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (caller holds the lock)"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS character_reports ("
+                "name_key TEXT NOT NULL, source_key TEXT NOT NULL, style_report TEXT NOT NULL, "
+                "version INTEGER NOT NULL, fingerprint TEXT NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (name_key, source_key))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+character_report_store = CharacterReportStore(
+    os.path.join(config.MODELS_DIR, CHARACTER_REPORT_FILENAME),
+    ttl_seconds=config.CHARACTER_REPORT_TTL_SECONDS
+)
@@ -0,0 +1,148 @@
+import re
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from threading import Lock
+from config import config
+from services.metrics import cache_lookups, current_labels
+
+def normalize_query(query: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace ("SpongeBob!" -> "spongebob")"""
+    return " ".join(re.sub(r"[^\w\s]", " ", query.lower()).split())
+
+class CharacterSearchCache:
+    """
+    Character search results cached by normalized query, with a prefix index.
+
+    Exact repeats of a query are answered from the result cache. Partial
+    queries typed on the way to (or back from) a known result are answered
+    from a sorted index over previous queries and the names of the
+    characters they returned, so typeahead does not need a model call.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: int = 24 * 3600,
+                 min_prefix_length: int = 3, max_results: int = 5):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.min_prefix_length = min_prefix_length
+        self.max_results = max_results
+        # normalized query -> (expires_at, characters)
+        self._entries: OrderedDict[str, tuple[float, list[dict]]] = OrderedDict()
+        # Sorted (key, query, rank) tuples, rebuilt lazily after the entries change
+        self._index: list[tuple[str, str, int]] = []
+        self._index_dirty = False
+        self._lock = Lock()
+        self.hits = 0
+        self.prefix_hits = 0
+        self.misses = 0
+
+    def lookup(self, query: str) -> list[dict] | None:
+        """
+        Answer a query from the cache.
+
+        Args:
+            query: The raw search query
+
+        Returns:
+            list or None: Cached characters, or None when the query is novel
+        """
+        normalized = normalize_query(query)
+        if not normalized:
+            return None
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(normalized)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(normalized)
+                self.hits += 1
+                cache_lookups.inc(cache="character_search", result="hit", **current_labels())
+                return [dict(c) for c in entry[1]]
+
+            if len(normalized) >= self.min_prefix_length:
+                matches = self._prefix_matches(normalized, now)
+                if matches:
+                    self.prefix_hits += 1
+                    cache_lookups.inc(cache="character_search", result="prefix_hit", **current_labels())
+                    return matches
+
+            self.misses += 1
+            cache_lookups.inc(cache="character_search", result="miss", **current_labels())
+            return None
+
+    def put(self, query: str, characters: list[dict]):
+        """Cache the model's results for a query"""
+        normalized = normalize_query(query)
+        if not normalized or self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[normalized] = (time.time() + self.ttl_seconds, [dict(c) for c in characters])
+            self._entries.move_to_end(normalized)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._index_dirty = True
+
+    def stats(self) -> dict:
+        """Hit/miss counters and cache size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "prefix_hits": self.prefix_hits,
+                "misses": self.misses,
+                "entries": len(self._entries)
+            }
+
+    def _prefix_matches(self, prefix: str, now: float) -> list[dict]:
+        """Characters from live entries whose query or name starts with the prefix (lock held)"""
+        self._purge_expired(now)
+        if self._index_dirty:
+            self._rebuild_index()
+
+        # Best rank per character: results of the query the prefix came from keep
+        # their order, name matches follow in the model's popularity order
+        best: dict[tuple[str, str], tuple[int, dict]] = {}
+        position = bisect_left(self._index, (prefix,))
+        while position < len(self._index) and self._index[position][0].startswith(prefix):
+            key, query, rank = self._index[position]
+            position += 1
+            characters = self._entries[query][1]
+            candidates = enumerate(characters) if rank < 0 else [(rank, characters[rank])]
+            for i, character in candidates:
+                score = i if rank < 0 else self.max_results + i
+                identity = (normalize_query(character["name"]), normalize_query(character["source"]))
+                if identity not in best or score < best[identity][0]:
+                    best[identity] = (score, character)
+
+        ranked = sorted(best.values(), key=lambda item: item[0])
+        return [dict(character) for _, character in ranked[:self.max_results]]
+
+    def _purge_expired(self, now: float):
+        expired = [query for query, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for query in expired:
+            del self._entries[query]
+        if expired:
+            self._index_dirty = True
+
+    def _rebuild_index(self):
+        """
+        Index each query (rank -1: all of its results) and every word-suffix of
+        each returned character's name, e.g. "spongebob squarepants" and
+        "squarepants" (rank: the character's position in the results).
+        """
+        index = []
+        for query, (_, characters) in self._entries.items():
+            index.append((query, query, -1))
+            for rank, character in enumerate(characters):
+                words = normalize_query(character["name"]).split()
+                for start in range(len(words)):
+                    index.append((" ".join(words[start:]), query, rank))
+        index.sort()
+        self._index = index
+        self._index_dirty = False
+
+character_search_cache = CharacterSearchCache(
+    max_entries=config.CHARACTER_SEARCH_CACHE_SIZE,
+    ttl_seconds=config.CHARACTER_SEARCH_CACHE_TTL_SECONDS,
+    min_prefix_length=config.CHARACTER_SEARCH_MIN_PREFIX
+)
@@ -1,28 +1,39 @@
 import os
 import json
-from openai import OpenAI
+from openai import AsyncOpenAI
 from typing import List, Dict
+from services.usage_tracker import usage_tracker
+from services.character_search_cache import character_search_cache
+from services.llm_scheduler import llm_scheduler
+from services.llm_client import get_llm_client
+from services.tokens import estimate_tokens
 
 class CharacterSearcher:
-    def __init__(self):
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
+    def __init__(self, client: AsyncOpenAI | None = None):
+        if client is None and not os.getenv('OPENAI_API_KEY'):
             raise ValueError("OPENAI_API_KEY environment variable is not set")
 
-        self.client = OpenAI(api_key=api_key)
+        self.client = client or get_llm_client()
         self.search_model = os.getenv('SEARCH_MODEL_NAME', 'gpt-4o-mini')
 
-    def search_characters(self, query: str) -> List[Dict[str, str]]:
+    async def search_characters(self, query: str) -> List[Dict[str, str]]:
         """
         Search for famous characters matching the query using GPT-4o-mini.
         Returns up to 5 characters ranked by popularity.
 
+        Repeated queries, and partial queries matching an earlier query or a
+        previously returned character name, are answered from the local cache.
+
         Args:
             query: The character name or type to search for
 
         Returns:
             List of character dictionaries with name, description, source, and category
         """
+        cached = character_search_cache.lookup(query)
+        if cached is not None:
+            return cached
+
         prompt = f"""Find up to 5 famous characters that match the search query: "{query}"
 
 Rules:
@@ -50,21 +61,27 @@ Return ONLY a valid JSON array with this exact structure:
 Do not include any other text, just the JSON array."""
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.search_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that finds famous characters. Always respond with valid JSON only."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=1000
+            response = await llm_scheduler.run(
+                lambda: self.client.chat.completions.create(
+                    model=self.search_model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are a helpful assistant that finds famous characters. Always respond with valid JSON only."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    temperature=0.3,
+                    max_tokens=1000
+                ),
+                # Prompt plus the completion budget
+                estimated_tokens=estimate_tokens(prompt) + 1000,
+                operation="search.characters"
             )
+            usage_tracker.record("search.characters", None, response.usage)
 
             result_text = response.choices[0].message.content.strip()
 
@@ -86,6 +103,7 @@ Do not include any other text, just the JSON array."""
                         'category': char['category']
                     })
 
+            character_search_cache.put(query, validated_characters)
             return validated_characters
 
         except json.JSONDecodeError as e:
@@ -0,0 +1,161 @@
+import os
+import time
+import sqlite3
+from threading import Lock
+from config import config
+
+CHECKPOINT_FILENAME = "checkpoints.sqlite3"
+
+class CheckpointStore:
+    """
+    Per-paragraph checkpoints for PDF transforms, keyed by (document hash, model).
+
+    Finished paragraphs are written in small batches as they are
+    transformed, so a retried or resumed request only has to process the
+    paragraphs still missing. The methods block on SQLite; call them from a
+    worker thread. A checkpoint is reset if the model's style report or the
+    paragraph count no longer match, and checkpoints untouched for
+    `ttl_seconds` are purged.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: int = 24 * 3600):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self._conn = None
+        self._lock = Lock()
+
+    def start(self, document_hash: str, model_name: str, total: int, report_hash: str) -> dict[int, str]:
+        """
+        Open (or create) the checkpoint for a document/model pair.
+
+        Args:
+            document_hash: Hash of the source PDF bytes
+            model_name: The style model used for the transform
+            total: Number of paragraphs in the document
+            report_hash: Hash of the model's current style report
+
+        Returns:
+            dict: Already transformed paragraphs, by paragraph index
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            self._purge_expired(conn, now)
+
+            row = conn.execute(
+                "SELECT total, report_hash FROM documents WHERE document_hash = ? AND model_name = ?",
+                (document_hash, model_name)
+            ).fetchone()
+
+            if row is not None and tuple(row) != (total, report_hash):
+                # Model was re-trained or extraction changed: start over
+                self._delete(conn, document_hash, model_name)
+                row = None
+
+            if row is None:
+                conn.execute(
+                    "INSERT INTO documents (document_hash, model_name, total, report_hash, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (document_hash, model_name, total, report_hash, now)
+                )
+                conn.commit()
+                return {}
+
+            conn.execute(
+                "UPDATE documents SET updated_at = ? WHERE document_hash = ? AND model_name = ?",
+                (now, document_hash, model_name)
+            )
+            conn.commit()
+            rows = conn.execute(
+                "SELECT idx, text FROM paragraphs WHERE document_hash = ? AND model_name = ?",
+                (document_hash, model_name)
+            ).fetchall()
+            return {idx: text for idx, text in rows}
+
+    def save_many(self, document_hash: str, model_name: str, paragraphs: list[tuple[int, str]]):
+        """Record a batch of transformed paragraphs, given as (index, text) pairs, in one commit"""
+        if not paragraphs:
+            return
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO paragraphs (document_hash, model_name, idx, text) VALUES (?, ?, ?, ?)",
+                [(document_hash, model_name, index, text) for index, text in paragraphs]
+            )
+            conn.execute(
+                "UPDATE documents SET updated_at = ? WHERE document_hash = ? AND model_name = ?",
+                (time.time(), document_hash, model_name)
+            )
+            conn.commit()
+
+    def get(self, document_hash: str, model_name: str) -> dict | None:
+        """
+        Fetch the (possibly partial) results of a checkpointed transform.
+
+        Returns:
+            dict or None: {"total": int, "completed": int, "paragraphs": list[str | None]}
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT total FROM documents WHERE document_hash = ? AND model_name = ?",
+                (document_hash, model_name)
+            ).fetchone()
+            if row is None:
+                return None
+
+            rows = conn.execute(
+                "SELECT idx, text FROM paragraphs WHERE document_hash = ? AND model_name = ?",
+                (document_hash, model_name)
+            ).fetchall()
+
+        total = row[0]
+        paragraphs: list[str | None] = [None] * total
+        for idx, text in rows:
+            if idx < total:
+                paragraphs[idx] = text
+
+        return {
+            "total": total,
+            "completed": len(rows),
+            "paragraphs": paragraphs
+        }
+
+    def _delete(self, conn: sqlite3.Connection, document_hash: str, model_name: str):
+        conn.execute("DELETE FROM paragraphs WHERE document_hash = ? AND model_name = ?", (document_hash, model_name))
+        conn.execute("DELETE FROM documents WHERE document_hash = ? AND model_name = ?", (document_hash, model_name))
+
+    def _purge_expired(self, conn: sqlite3.Connection, now: float):
+        expired = conn.execute(
+            "SELECT document_hash, model_name FROM documents WHERE updated_at < ?",
+            (now - self.ttl_seconds,)
+        ).fetchall()
+        for document_hash, model_name in expired:
+            self._delete(conn, document_hash, model_name)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (caller holds the lock)"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "document_hash TEXT NOT NULL, model_name TEXT NOT NULL, total INTEGER NOT NULL, "
+                "report_hash TEXT NOT NULL, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (document_hash, model_name))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS paragraphs ("
+                "document_hash TEXT NOT NULL, model_name TEXT NOT NULL, idx INTEGER NOT NULL, "
+                "text TEXT NOT NULL, PRIMARY KEY (document_hash, model_name, idx))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+checkpoint_store = CheckpointStore(
+    os.path.join(config.MODELS_DIR, CHECKPOINT_FILENAME),
+    ttl_seconds=config.CHECKPOINT_TTL_SECONDS
+)
@@ -0,0 +1,216 @@
+import re
+from collections import Counter
+import numpy as np
+from services.tokens import estimate_tokens
+
+FUNCTION_WORDS = [
+    "the", "a", "an", "and", "but", "or", "so", "if", "then", "than",
+    "of", "in", "on", "at", "to", "for", "with", "from", "by", "about",
+    "as", "into", "like", "through", "over", "after", "before", "between",
+    "i", "me", "my", "we", "our", "you", "your", "he", "she", "it", "they",
+    "them", "this", "that", "these", "those", "what", "which", "who",
+    "is", "was", "are", "were", "be", "been", "have", "has", "had",
+    "do", "does", "did", "will", "would", "can", "could", "should", "must",
+    "not", "no", "very", "just", "oh", "well", "yes"
+]
+FUNCTION_WORD_INDEX = {word: i for i, word in enumerate(FUNCTION_WORDS)}
+
+PUNCTUATION = [",", ".", ";", ":", "!", "?", "\"", "'", "(", "-", "—", "…"]
+
+# Upper bounds (in words) of the sentence-length histogram bins
+SENTENCE_LENGTH_BINS = [5, 10, 15, 20, 30, 45]
+
+WORD_PATTERN = re.compile(r"[a-z']+")
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?…])\s+")
+
+class CorpusSampler:
+    """
+    Selects a token-budgeted, representative subset of a corpus for style analysis.
+
+    The corpus is split into passages, and each passage is described by a
+    stylometric feature vector: sentence-length distribution, punctuation
+    profile, function-word frequencies and frequencies of the corpus's most
+    distinctive word bigrams. Passages are then picked greedily so that the
+    token-weighted mean profile of the sample tracks the profile of the
+    whole corpus, until the token budget is used.
+    """
+
+    def __init__(self, token_budget: int = 20000, passage_tokens: int = 300, top_ngrams: int = 100):
+        self.token_budget = token_budget
+        self.passage_tokens = passage_tokens
+        self.top_ngrams = top_ngrams
+
+    def sample(self, corpus: str) -> dict:
+        """
+        Sample a corpus down to the token budget.
+
+        Args:
+            corpus: The full text corpus
+
+        Returns:
+            dict: {"text": str, "stats": dict} where text is the sampled corpus
+                (passages kept in their original order) and stats reports the
+                sample size and how well it covers the corpus profile
+        """
+        corpus_tokens = estimate_tokens(corpus)
+        if self.token_budget <= 0 or corpus_tokens <= self.token_budget:
+            return {
+                "text": corpus,
+                "stats": {
+                    "sampled": False,
+                    "corpus_tokens": corpus_tokens,
+                    "sample_tokens": corpus_tokens
+                }
+            }
+
+        passages = self._split_passages(corpus)
+        tokens = np.array([estimate_tokens(p) for p in passages], dtype=float)
+        ngrams = self._distinctive_ngrams(passages)
+        features = self._features(passages, ngrams)
+
+        selected = self._select(_standardize(features), tokens)
+        sample_text = "\n\n".join(passages[i] for i in selected)
+
+        weights = tokens / tokens.sum()
+        corpus_profile = weights @ features
+        sample_weights = tokens[selected] / tokens[selected].sum()
+        sample_profile = sample_weights @ features[selected]
+
+        ngram_columns = features[:, -len(ngrams):] if ngrams else np.zeros((len(passages), 0))
+        covered_ngrams = int((ngram_columns[selected].sum(axis=0) > 0).sum()) if ngrams else 0
+
+        return {
+            "text": sample_text,
+            "stats": {
+                "sampled": True,
+                "corpus_tokens": corpus_tokens,
+                "sample_tokens": int(tokens[selected].sum()),
+                "passages_total": len(passages),
+                "passages_selected": len(selected),
+                "profile_similarity": round(_cosine(corpus_profile, sample_profile), 4),
+                "ngram_coverage": round(covered_ngrams / len(ngrams), 4) if ngrams else 1.0
+            }
+        }
+
+    def _split_passages(self, corpus: str) -> list[str]:
+        """
+        Split on blank lines, breaking long paragraphs into sentence runs.
+
+        Passages keep their original text, including line breaks inside a
+        paragraph (dialogue, verse, lists), so sampled and unsampled corpora
+        reach the learner with the same formatting.
+        """
+        max_chars = self.passage_tokens * 4
+        passages = []
+        for paragraph in re.split(r"\n\s*\n", corpus):
+            paragraph = paragraph.strip("\r\n").rstrip()
+            if not paragraph.strip():
+                continue
+            if len(paragraph) <= max_chars:
+                passages.append(paragraph)
+                continue
+
+            # Each sentence keeps the whitespace that follows it
+            ends = [match.end() for match in SENTENCE_PATTERN.finditer(paragraph)] + [len(paragraph)]
+            current, start = "", 0
+            for end in ends:
+                sentence = paragraph[start:end]
+                start = end
+                if current and len(current) + len(sentence) > max_chars:
+                    passages.append(current.rstrip())
+                    current = ""
+                current += sentence
+            if current.strip():
+                passages.append(current.rstrip())
+
+        return passages
+
+    def _distinctive_ngrams(self, passages: list[str]) -> list[tuple[str, str]]:
+        """Most frequent word bigrams that are not made only of function words"""
+        counts = Counter()
+        for passage in passages:
+            words = WORD_PATTERN.findall(passage.lower())
+            counts.update(
+                bigram for bigram in zip(words, words[1:])
+                if not (bigram[0] in FUNCTION_WORD_INDEX and bigram[1] in FUNCTION_WORD_INDEX)
+            )
+
+        return [bigram for bigram, count in counts.most_common(self.top_ngrams) if count > 1]
+
+    def _features(self, passages: list[str], ngrams: list[tuple[str, str]]) -> np.ndarray:
+        """Per-passage stylometric feature matrix"""
+        ngram_index = {bigram: i for i, bigram in enumerate(ngrams)}
+        n_sentence = len(SENTENCE_LENGTH_BINS) + 1
+        offsets = np.cumsum([0, n_sentence, len(PUNCTUATION), len(FUNCTION_WORDS)])
+        features = np.zeros((len(passages), offsets[-1] + len(ngrams)))
+
+        for row, passage in enumerate(passages):
+            # Whitespace is normalized for the features only; the passage text is left as is
+            passage = " ".join(passage.split())
+            sentences = [s for s in SENTENCE_PATTERN.split(passage) if s]
+            lengths = [len(s.split()) for s in sentences]
+            bins = np.searchsorted(SENTENCE_LENGTH_BINS, lengths, side="left")
+            features[row, offsets[0]:offsets[1]] = np.bincount(bins, minlength=n_sentence) / max(len(lengths), 1)
+
+            chars = max(len(passage), 1)
+            features[row, offsets[1]:offsets[2]] = [passage.count(p) * 100 / chars for p in PUNCTUATION]
+
+            words = WORD_PATTERN.findall(passage.lower())
+            n_words = max(len(words), 1)
+            for word in words:
+                index = FUNCTION_WORD_INDEX.get(word)
+                if index is not None:
+                    features[row, offsets[2] + index] += 1
+            features[row, offsets[2]:offsets[3]] /= n_words
+
+            for bigram in zip(words, words[1:]):
+                index = ngram_index.get(bigram)
+                if index is not None:
+                    features[row, offsets[3] + index] += 1 / n_words
+
+        return features
+
+    def _select(self, features: np.ndarray, tokens: np.ndarray) -> list[int]:
+        """
+        Greedily pick passages whose token-weighted mean profile best matches the corpus.
+
+        Returns:
+            list: Selected passage indices, in document order
+        """
+        target = (tokens / tokens.sum()) @ features
+        available = np.ones(len(tokens), dtype=bool)
+        selected = []
+        profile_sum = np.zeros(features.shape[1])
+        used_tokens = 0.0
+
+        while True:
+            candidates = available & (used_tokens + tokens <= self.token_budget)
+            if not candidates.any():
+                break
+
+            # Distance from the corpus profile if each candidate were added
+            new_means = (profile_sum + features * tokens[:, None]) / (used_tokens + tokens)[:, None]
+            distances = np.linalg.norm(new_means - target, axis=1)
+            distances[~candidates] = np.inf
+
+            best = int(np.argmin(distances))
+            selected.append(best)
+            available[best] = False
+            profile_sum += features[best] * tokens[best]
+            used_tokens += tokens[best]
+
+        if not selected:
+            # Budget smaller than any passage: keep the most typical one
+            selected.append(int(np.argmin(np.linalg.norm(features - target, axis=1))))
+
+        return sorted(selected)
+
+def _standardize(features: np.ndarray) -> np.ndarray:
+    """Scale each feature column to zero mean and unit variance so no group dominates distances"""
+    std = features.std(axis=0)
+    std[std == 0] = 1
+    return (features - features.mean(axis=0)) / std
+
+def _cosine(a: np.ndarray, b: np.ndarray) -> float:
+    norm = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(a @ b / norm) if norm else 1.0
@@ -0,0 +1,162 @@
+import os
+import time
+import json
+import zlib
+import sqlite3
+from threading import Lock
+from config import config
+from services.metrics import cache_lookups, current_labels
+
+EXTRACTION_CACHE_FILENAME = "extraction_cache.sqlite3"
+
+class ExtractionCache:
+    """
+    Disk-backed cache of PDF extraction results, keyed by the SHA-256 of the PDF bytes.
+
+    Stores the validated text, page count and paragraphs of each document
+    (zlib-compressed JSON), so previewing a PDF and then transforming or
+    training on it parses it only once, and later requests can reference the
+    document by hash instead of uploading it again. The least recently used
+    documents are evicted once the stored data exceeds `max_bytes`.
+    """
+
+    def __init__(self, db_path: str, max_bytes: int = 256 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._conn = None
+        self._lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, document_hash: str) -> dict | None:
+        """
+        Look up the extraction of a document.
+
+        Returns:
+            dict or None: {"valid", "error", "has_text", "pages", "text",
+                "paragraphs"} as returned by PDFProcessor, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT data FROM extractions WHERE document_hash = ?", (document_hash,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                cache_lookups.inc(cache="pdf_extraction", result="miss", **current_labels())
+                return None
+
+            conn.execute(
+                "UPDATE extractions SET last_access = ? WHERE document_hash = ?", (time.time(), document_hash)
+            )
+            conn.commit()
+            self.hits += 1
+
+        cache_lookups.inc(cache="pdf_extraction", result="hit", **current_labels())
+        stored = json.loads(zlib.decompress(row[0]))
+        return {
+            "valid": True,
+            "error": None,
+            "has_text": True,
+            "pages": stored["pages"],
+            "text": stored["text"],
+            "paragraphs": stored["paragraphs"]
+        }
+
+    def contains(self, document_hash: str) -> bool:
+        """Whether a document is cached (does not count as a lookup or refresh it)"""
+        if not self.enabled:
+            return False
+        with self._lock:
+            return self._connect().execute(
+                "SELECT 1 FROM extractions WHERE document_hash = ?", (document_hash,)
+            ).fetchone() is not None
+
+    def put(self, document_hash: str, result: dict):
+        """Store a valid extraction result and evict least recently used documents over the size limit"""
+        if not self.enabled or not result.get("valid"):
+            return
+
+        data = zlib.compress(json.dumps({
+            "pages": result["pages"],
+            "text": result["text"],
+            "paragraphs": result["paragraphs"]
+        }, ensure_ascii=False).encode('utf-8'))
+        if len(data) > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO extractions (document_hash, data, size, last_access) VALUES (?, ?, ?, ?)",
+                (document_hash, data, len(data), now)
+            )
+
+            # Evict least recently used documents until the cache fits
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM extractions").fetchone()[0]
+            if total > self.max_bytes:
+                rows = conn.execute(
+                    "SELECT document_hash, size FROM extractions WHERE document_hash != ? "
+                    "ORDER BY last_access ASC",
+                    (document_hash,)
+                )
+                evicted = []
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    evicted.append((key,))
+                    total -= size
+                conn.executemany("DELETE FROM extractions WHERE document_hash = ?", evicted)
+                self.evictions += len(evicted)
+            conn.commit()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        entries, size = 0, 0
+        if self.enabled:
+            with self._lock:
+                entries, size = self._connect().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extractions"
+                ).fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (caller holds the lock)"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS extractions ("
+                "document_hash TEXT PRIMARY KEY, data BLOB NOT NULL, "
+                "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_extractions_last_access ON extractions (last_access)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+extraction_cache = ExtractionCache(
+    os.path.join(config.MODELS_DIR, EXTRACTION_CACHE_FILENAME),
+    max_bytes=config.PDF_EXTRACTION_CACHE_MAX_MB * 1024 * 1024
+)
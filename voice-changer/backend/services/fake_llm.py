@@ -0,0 +1,149 @@
+import re
+import json
+import random
+import asyncio
+import hashlib
+import httpx
+from types import SimpleNamespace
+from typing import AsyncIterator
+from openai import RateLimitError
+from services.tokens import estimate_tokens
+
+# Sections of the prompts built by StyleActor
+INPUT_TEXT_PATTERN = re.compile(r"INPUT TEXT:\n(.*)\n\nTRANSFORMED TEXT:", re.DOTALL)
+INPUT_PARAGRAPHS_PATTERN = re.compile(r"INPUT PARAGRAPHS:\n(.*)\n\nTRANSFORMED PARAGRAPHS:", re.DOTALL)
+QUERY_PATTERN = re.compile(r'search query: "(.*?)"')
+
+REPORT_SECTIONS = [
+    "Vocabulary", "Sentence structure", "Tone", "Mannerisms",
+    "Catchphrases", "Punctuation", "Energy level", "Formatting"
+]
+CATEGORIES = ["tv", "movie", "literature", "historical", "game", "anime", "cartoon"]
+
+class FakeLLMClient:
+    """
+    Local stand-in for the OpenAI client, for benchmarks and offline runs.
+
+    Implements the subset of AsyncOpenAI the services use
+    (responses.create, with and without streaming, and
+    chat.completions.create). Output is a deterministic function of the
+    prompt; latency is drawn from a log-normal distribution around
+    `latency_ms` plus `ms_per_token` per output token, from a seeded RNG.
+    A fraction of calls can fail with a 429 to exercise retry handling.
+    """
+
+    def __init__(self, latency_ms: float = 500.0, latency_sigma: float = 0.3, ms_per_token: float = 0.0,
+                 report_tokens: int = 800, rate_limit_rate: float = 0.0, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.ms_per_token = ms_per_token
+        self.report_tokens = report_tokens
+        self.rate_limit_rate = rate_limit_rate
+        self._random = random.Random(seed)
+        self.responses = SimpleNamespace(create=self._create_response)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create_chat_completion))
+
+    async def close(self):
+        pass
+
+    async def _create_response(self, model: str, input: str, instructions: str = "",
+                               stream: bool = False, **kwargs):
+        output = self._respond(input)
+        usage = self._usage(instructions + input, output, chat=False)
+        if stream:
+            await self._wait(0)
+            return self._stream(output, usage)
+
+        await self._wait(usage.output_tokens)
+        return SimpleNamespace(output_text=output, usage=usage)
+
+    async def _create_chat_completion(self, model: str, messages: list[dict], **kwargs):
+        prompt = "\n".join(message["content"] for message in messages)
+        match = QUERY_PATTERN.search(prompt)
+        output = self._characters(match.group(1) if match else prompt)
+        usage = self._usage(prompt, output, chat=True)
+
+        await self._wait(usage.completion_tokens)
+        message = SimpleNamespace(role="assistant", content=output)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+    async def _stream(self, output: str, usage) -> AsyncIterator:
+        words = re.findall(r"\S+\s*", output)
+        for word in words:
+            await asyncio.sleep(self.ms_per_token * estimate_tokens(word) / 1000)
+            yield SimpleNamespace(type="response.output_text.delta", delta=word)
+        yield SimpleNamespace(type="response.completed", response=SimpleNamespace(usage=usage))
+
+    def _respond(self, prompt: str) -> str:
+        """Deterministic output for actor (single and packed) and learner prompts"""
+        packed = INPUT_PARAGRAPHS_PATTERN.search(prompt)
+        if packed:
+            return re.sub(r"(<<<P\d+>>>\n)(.*?)(?=\n\n<<<P|\Z)",
+                          lambda m: m.group(1) + self._restyle(m.group(2)),
+                          packed.group(1), flags=re.DOTALL)
+
+        single = INPUT_TEXT_PATTERN.search(prompt)
+        if single:
+            return self._restyle(single.group(1))
+
+        return self._report(prompt)
+
+    def _restyle(self, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{text.strip()} (restyled {digest[:6]})"
+
+    def _report(self, prompt: str) -> str:
+        """A markdown style report of about `report_tokens` tokens, seeded by the prompt"""
+        seed = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8], 16)
+        words = re.findall(r"[A-Za-z']{4,}", prompt) or ["style"]
+        rng = random.Random(seed)
+        lines = ["# Style Report", ""]
+        target_chars = self.report_tokens * 4
+        while sum(len(line) + 1 for line in lines) < target_chars:
+            section = REPORT_SECTIONS[(len(lines) // 4) % len(REPORT_SECTIONS)]
+            sample = " ".join(rng.choice(words) for _ in range(12))
+            lines.append(f"## {section}\n- Frequently uses words such as: {sample}\n")
+        return "\n".join(lines)
+
+    def _characters(self, query: str) -> str:
+        seed = int(hashlib.sha256(query.encode("utf-8")).hexdigest()[:8], 16)
+        rng = random.Random(seed)
+        name = query.strip().title() or "Anonymous"
+        return json.dumps([
+            {
+                "name": f"{name} {suffix}",
+                "description": f"A well-known {name.lower()} character with a distinctive voice.",
+                "source": f"{name} Chronicles",
+                "category": rng.choice(CATEGORIES)
+            }
+            for suffix in ["Prime", "the Younger", "of the North"][:rng.randint(1, 3)]
+        ])
+
+    def _usage(self, prompt: str, output: str, chat: bool):
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(output)
+        if chat:
+            return SimpleNamespace(
+                prompt_tokens=input_tokens,
+                completion_tokens=output_tokens,
+                total_tokens=input_tokens + output_tokens,
+                prompt_tokens_details=SimpleNamespace(cached_tokens=0)
+            )
+        return SimpleNamespace(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+            input_tokens_details=SimpleNamespace(cached_tokens=0)
+        )
+
+    async def _wait(self, output_tokens: int):
+        """Sleep for a sampled latency, or fail with a simulated rate limit"""
+        latency_ms = self.latency_ms * self._random.lognormvariate(0, self.latency_sigma)
+        if self.rate_limit_rate and self._random.random() < self.rate_limit_rate:
+            # Rate-limit rejections come back faster than completions
+            await asyncio.sleep(latency_ms / 10 / 1000)
+            request = httpx.Request("POST", "https://fake-llm.local/v1")
+            response = httpx.Response(429, request=request, headers={"retry-after": "0"})
+            raise RateLimitError("Simulated rate limit", response=response, body=None)
+
+        await asyncio.sleep((latency_ms + self.ms_per_token * output_tokens) / 1000)
@@ -0,0 +1,174 @@
+import os
+import time
+import uuid
+import asyncio
+from typing import Awaitable, Callable
+from config import config
+from services.metrics import endpoint_label, current_labels, job_queue_wait, jobs_in_flight
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+class Job:
+    """A unit of background work and its status"""
+
+    def __init__(self, kind: str, handler: Callable[["Job"], Awaitable[object]]):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.handler = handler
+        self.status = "queued"  # queued -> running -> completed | failed
+        self.progress_done = 0
+        self.progress_total = 0
+        self.result = None
+        self.error = None
+        # Temporary files backing the result, removed when the job is pruned
+        self.files: list[str] = []
+        self.created_at = time.time()
+        # Endpoint that submitted the job, so its work is attributed to it in metrics
+        self.endpoint = current_labels()["endpoint"]
+        self.started_at = None
+        self.finished_at = None
+
+    def set_progress(self, done: int, total: int):
+        self.progress_done = done
+        self.progress_total = total
+
+    def to_dict(self) -> dict:
+        """Public view of the job (without the result payload)"""
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": {
+                "done": self.progress_done,
+                "total": self.progress_total
+            },
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+    def remove_files(self):
+        """Delete the job's temporary files"""
+        for path in self.files:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        self.files = []
+
+class JobQueue:
+    """
+    Bounded in-process job queue drained by a fixed pool of worker tasks.
+
+    Finished jobs (and their results, including any temporary result files)
+    are kept for `ttl_seconds` so clients can poll their status and download
+    the result.
+    """
+
+    def __init__(self, workers: int = 2, max_queued: int = 100, ttl_seconds: int = 3600):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.ttl_seconds = ttl_seconds
+        self._jobs: dict[str, Job] = {}
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self):
+        """Start the worker tasks (call from the running event loop)"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(max(1, self.workers))]
+
+    async def stop(self):
+        """Cancel the worker tasks and remove the jobs' temporary files"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job in self._jobs.values():
+            job.remove_files()
+
+    def submit(self, kind: str, handler: Callable[[Job], Awaitable[object]]) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            kind: Job type label (e.g. "transform-pdf")
+            handler: Coroutine function receiving the Job; its return value
+                becomes the job result
+
+        Returns:
+            Job: The queued job
+
+        Raises:
+            QueueFullError: If the queue is at capacity
+        """
+        if self._queue is None:
+            raise RuntimeError("Job queue has not been started")
+
+        self._prune()
+        job = Job(kind, handler)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Job queue is full ({self.max_queued} jobs waiting), try again later")
+
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        self._prune()
+        return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        """Queue depth and job counts by status"""
+        counts = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "workers": len(self._tasks),
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queued": self.max_queued,
+            "jobs": counts
+        }
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            job_queue_wait.observe(job.started_at - job.created_at, kind=job.kind)
+            try:
+                with endpoint_label(job.endpoint), jobs_in_flight.track(kind=job.kind):
+                    job.result = await job.handler(job)
+                job.status = "completed"
+            except asyncio.CancelledError:
+                job.status = "failed"
+                job.error = "Job was cancelled"
+                raise
+            except Exception as e:
+                job.status = "failed"
+                job.error = getattr(e, "detail", None) or str(e)
+            finally:
+                job.finished_at = time.time()
+                job.handler = None
+                self._queue.task_done()
+
+    def _prune(self):
+        """Forget finished jobs older than the TTL"""
+        cutoff = time.time() - self.ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            self._jobs.pop(job_id).remove_files()
+
+job_queue = JobQueue(
+    workers=config.JOB_WORKERS,
+    max_queued=config.JOB_QUEUE_SIZE,
+    ttl_seconds=config.JOB_TTL_SECONDS
+)
@@ -0,0 +1,62 @@
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from config import config
+from services.fake_llm import FakeLLMClient
+
+_client: AsyncOpenAI | FakeLLMClient | None = None
+
+def get_llm_client() -> AsyncOpenAI | FakeLLMClient:
+    """
+    Return the process-wide LLM client, creating it on first use.
+
+    With LLM_BACKEND=openai (the default) all services share one OpenAI
+    client, so connections (and their TLS sessions) are pooled and kept
+    alive across services and requests. Pool size, keep-alive, timeouts and
+    HTTP/2 are set from config. LLM_BACKEND=fake returns the deterministic
+    local stand-in used for benchmarks.
+
+    Returns:
+        AsyncOpenAI or FakeLLMClient: The shared client
+    """
+    global _client
+    if _client is None and config.LLM_BACKEND == "fake":
+        _client = FakeLLMClient(
+            latency_ms=config.FAKE_LLM_LATENCY_MS,
+            latency_sigma=config.FAKE_LLM_LATENCY_SIGMA,
+            ms_per_token=config.FAKE_LLM_MS_PER_TOKEN,
+            report_tokens=config.FAKE_LLM_REPORT_TOKENS,
+            rate_limit_rate=config.FAKE_LLM_RATE_LIMIT_RATE,
+            seed=config.FAKE_LLM_SEED
+        )
+    elif _client is None:
+        _client = AsyncOpenAI(
+            api_key=config.OPENAI_API_KEY,
+            http_client=_create_http_client(),
+            # Retries are handled by the LLM scheduler
+            max_retries=0
+        )
+    return _client
+
+async def close_llm_client():
+    """Close the shared client's connections (on shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+def _create_http_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=config.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=config.LLM_KEEPALIVE_EXPIRY_SECONDS
+    )
+    timeout = httpx.Timeout(config.LLM_READ_TIMEOUT_SECONDS, connect=config.LLM_CONNECT_TIMEOUT_SECONDS)
+
+    if config.LLM_HTTP2:
+        try:
+            return DefaultAsyncHttpxClient(limits=limits, timeout=timeout, http2=True)
+        except ImportError:
+            # HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+            print("✗ LLM_HTTP2 is enabled but the h2 package is not installed, using HTTP/1.1")
+
+    return DefaultAsyncHttpxClient(limits=limits, timeout=timeout)
@@ -0,0 +1,244 @@
+import time
+import random
+import asyncio
+import heapq
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable
+from openai import APIConnectionError, APIStatusError
+from config import config
+from services.metrics import (
+    llm_request_duration, llm_in_flight, llm_queue_wait, llm_retries, current_labels
+)
+
+# Priority classes, most urgent first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_PREVIEW = 1
+PRIORITY_BULK = 2
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_PREVIEW: "preview",
+    PRIORITY_BULK: "bulk"
+}
+
+# Priority of LLM calls made from the current task (inherited by tasks it creates)
+_current_priority: ContextVar[int] = ContextVar("llm_priority", default=PRIORITY_INTERACTIVE)
+
+def current_llm_priority() -> int:
+    """Priority class of LLM calls made from the current task"""
+    return _current_priority.get()
+
+@contextmanager
+def llm_priority(priority: int):
+    """Run the LLM calls made inside this block with the given priority class"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+class TokenBucket:
+    """Refills `limit` units per minute, holding at most one minute's worth"""
+
+    def __init__(self, limit_per_minute: int):
+        self.capacity = float(limit_per_minute)
+        self.rate = limit_per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def delay(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 when they are now)"""
+        if not self.enabled:
+            return 0.0
+        self._refill()
+        # A request larger than the bucket waits for a full bucket instead of forever
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float):
+        """Consume units (a negative amount returns them)"""
+        if not self.enabled:
+            return
+        self._refill()
+        self.level = min(self.capacity, self.level - amount)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+class LLMScheduler:
+    """
+    Admission control for every outbound LLM call.
+
+    Calls wait in a priority queue until both the requests-per-minute and the
+    tokens-per-minute buckets can cover them; interactive calls are admitted
+    before previews, and previews before bulk PDF work. Rate-limit (429),
+    server (5xx) and connection errors are retried with jittered exponential
+    backoff, honouring Retry-After when the provider sends one.
+    """
+
+    def __init__(self, rpm_limit: int = 0, tpm_limit: int = 0, max_retries: int = 5,
+                 retry_base_seconds: float = 1.0, retry_max_seconds: float = 30.0):
+        self.requests = TokenBucket(rpm_limit)
+        self.tokens = TokenBucket(tpm_limit)
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        # Heap of (priority, sequence, estimated_tokens, future)
+        self._waiting: list[tuple[int, int, float, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._metrics = {
+            priority: {"admitted": 0, "queue_seconds_total": 0.0, "queue_seconds_max": 0.0}
+            for priority in PRIORITY_NAMES
+        }
+        self.retries = 0
+        self.rate_limited = 0
+        self.failures = 0
+
+    async def run(self, call: Callable[[], Awaitable[Any]], estimated_tokens: int,
+                  operation: str = "", model_name: str | None = None) -> Any:
+        """
+        Run an LLM call once the rate limits admit it, retrying transient errors.
+
+        Args:
+            call: Issues the API request (invoked again for each retry)
+            estimated_tokens: Estimated tokens the request will consume
+            operation: "service.method" label for metrics, e.g. "actor.transform"
+            model_name: Style model the call is made for (metrics label)
+
+        Returns:
+            The call's result
+        """
+        priority = _current_priority.get()
+        service, _, method = operation.partition(".")
+        labels = current_labels(model_name)
+        attempt = 0
+        while True:
+            await self._acquire(priority, estimated_tokens, labels)
+            started = time.perf_counter()
+            try:
+                with llm_in_flight.track(service=service, method=method):
+                    result = await call()
+            except (APIStatusError, APIConnectionError) as e:
+                llm_request_duration.observe(time.perf_counter() - started, service=service, method=method,
+                                             outcome="error", **labels)
+                status = getattr(e, "status_code", None)
+                if status == 429:
+                    self.rate_limited += 1
+                retryable = status is None or status == 429 or status >= 500
+                if not retryable or attempt >= self.max_retries:
+                    self.failures += 1
+                    raise
+                self.retries += 1
+                llm_retries.inc(service=service, method=method, status=status or "connection")
+                await asyncio.sleep(self._backoff(attempt, e))
+                attempt += 1
+                continue
+
+            llm_request_duration.observe(time.perf_counter() - started, service=service, method=method,
+                                         outcome="ok", **labels)
+
+            # Correct the token bucket with the tokens actually used
+            usage = getattr(result, "usage", None)
+            used = getattr(usage, "total_tokens", None) if usage is not None else None
+            if used is not None:
+                self.tokens.take(used - estimated_tokens)
+            return result
+
+    def stats(self) -> dict:
+        """Queue depth, queue-time metrics per priority class and retry counters"""
+        waiting = [entry for entry in self._waiting if not entry[3].done()]
+        return {
+            "queued": {
+                name: sum(1 for entry in waiting if entry[0] == priority)
+                for priority, name in PRIORITY_NAMES.items()
+            },
+            "queue_time": {
+                PRIORITY_NAMES[priority]: {
+                    "admitted": m["admitted"],
+                    "avg_seconds": round(m["queue_seconds_total"] / m["admitted"], 4) if m["admitted"] else 0.0,
+                    "max_seconds": round(m["queue_seconds_max"], 4)
+                }
+                for priority, m in self._metrics.items()
+            },
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "failures": self.failures,
+            "limits": {
+                "rpm": int(self.requests.capacity),
+                "tpm": int(self.tokens.capacity)
+            }
+        }
+
+    async def _acquire(self, priority: int, estimated_tokens: float, labels: dict):
+        """Wait in the priority queue until the buckets admit this call"""
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._sequence), estimated_tokens, future)
+        heapq.heappush(self._waiting, entry)
+        queued_at = time.monotonic()
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Let the next waiter through if this one was at the head of the queue
+            self._dispatch()
+            raise
+
+        waited = time.monotonic() - queued_at
+        metrics = self._metrics.setdefault(
+            priority, {"admitted": 0, "queue_seconds_total": 0.0, "queue_seconds_max": 0.0}
+        )
+        metrics["admitted"] += 1
+        metrics["queue_seconds_total"] += waited
+        metrics["queue_seconds_max"] = max(metrics["queue_seconds_max"], waited)
+        llm_queue_wait.observe(waited, priority=PRIORITY_NAMES.get(priority, str(priority)), **labels)
+
+    def _dispatch(self):
+        """Admit waiters in priority order while both buckets have capacity"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._waiting:
+            _, _, estimated_tokens, future = self._waiting[0]
+            if future.done():
+                # Cancelled while waiting
+                heapq.heappop(self._waiting)
+                continue
+
+            delay = max(self.requests.delay(1), self.tokens.delay(estimated_tokens))
+            if delay > 0:
+                # Strict priority: lower classes wait behind the head of the queue
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+
+            heapq.heappop(self._waiting)
+            self.requests.take(1)
+            self.tokens.take(estimated_tokens)
+            future.set_result(None)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, at least the provider's Retry-After"""
+        delay = random.uniform(0, min(self.retry_max_seconds, self.retry_base_seconds * 2 ** attempt))
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        try:
+            delay = max(delay, min(self.retry_max_seconds, float(retry_after)))
+        except (TypeError, ValueError):
+            pass
+        return delay
+
+llm_scheduler = LLMScheduler(
+    rpm_limit=config.LLM_RPM_LIMIT,
+    tpm_limit=config.LLM_TPM_LIMIT,
+    max_retries=config.LLM_MAX_RETRIES,
+    retry_base_seconds=config.LLM_RETRY_BASE_SECONDS,
+    retry_max_seconds=config.LLM_RETRY_MAX_SECONDS
+)
@@ -0,0 +1,212 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+
+# Request-scoped labels: the route template being served and the style model
+# being used, set by the HTTP middleware / job workers and by StyleActor
+_endpoint: ContextVar[str] = ContextVar("metrics_endpoint", default="")
+_model: ContextVar[str] = ContextVar("metrics_model", default="")
+
+@contextmanager
+def endpoint_label(endpoint: str):
+    """Attribute metrics recorded inside this block to an endpoint"""
+    token = _endpoint.set(endpoint)
+    try:
+        yield
+    finally:
+        _endpoint.reset(token)
+
+@contextmanager
+def model_label(model_name: str | None):
+    """Attribute metrics recorded inside this block to a style model"""
+    token = _model.set(model_name or "")
+    try:
+        yield
+    finally:
+        _model.reset(token)
+
+def current_labels(model_name: str | None = None) -> dict:
+    """The endpoint and model labels for the current request"""
+    return {"endpoint": _endpoint.get(), "model": model_name or _model.get()}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self._lock = Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _format_labels(self, key: tuple, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.type}"]
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return super().render() + [f"{self.name}{self._format_labels(k)} {_number(v)}" for k, v in values]
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels):
+        """Count the block as in flight while it runs"""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return super().render() + [f"{self.name}{self._format_labels(k)} {_number(v)}" for k, v in values]
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, description, labelnames)
+        self.buckets = buckets
+        # label key -> (per-bucket counts with a final +Inf slot, sum)
+        self._values: dict[tuple, tuple[list[int], float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the block in seconds"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted((k, (list(c), s)) for k, (c, s) in self._values.items())
+
+        lines = super().render()
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = 'le="%s"' % _number(bound)
+                lines.append(f"{self.name}_bucket{self._format_labels(key, le)} {cumulative}")
+            cumulative += counts[-1]
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{self._format_labels(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {_number(total)}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """Holds the process's metrics and renders them in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def counter(self, name: str, description: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, description, labelnames))
+
+    def gauge(self, name: str, description: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, description, labelnames))
+
+    def histogram(self, name: str, description: str, labelnames: tuple[str, ...] = (),
+                  buckets: tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, description, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests served", ("endpoint", "method", "status"))
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency (until the response starts)", ("endpoint", "method"))
+http_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests being served", ("endpoint",))
+
+llm_request_duration = registry.histogram(
+    "llm_request_duration_seconds", "Latency of LLM API calls, excluding scheduler queueing",
+    ("service", "method", "endpoint", "model", "outcome"))
+llm_in_flight = registry.gauge(
+    "llm_requests_in_flight", "LLM API calls in flight", ("service", "method"))
+llm_tokens = registry.counter(
+    "llm_tokens_total", "Tokens reported by the LLM API",
+    ("service", "method", "endpoint", "model", "type"))
+llm_queue_wait = registry.histogram(
+    "llm_queue_wait_seconds", "Time LLM calls wait for the rate-limit scheduler", ("priority", "endpoint", "model"))
+llm_retries = registry.counter(
+    "llm_retries_total", "LLM calls retried after a transient error", ("service", "method", "status"))
+
+pdf_stage_duration = registry.histogram(
+    "pdf_stage_duration_seconds", "Time spent in PDF validate/extract/generate stages", ("stage", "endpoint"))
+style_report_load_duration = registry.histogram(
+    "style_report_load_seconds", "Style report load time", ("endpoint", "model", "source"))
+cache_lookups = registry.counter(
+    "cache_lookups_total", "Cache lookups by cache and result", ("cache", "result", "endpoint", "model"))
+
+job_queue_wait = registry.histogram(
+    "job_queue_wait_seconds", "Time background jobs wait for a worker", ("kind",))
+jobs_in_flight = registry.gauge(
+    "jobs_in_flight", "Background jobs being processed", ("kind",))
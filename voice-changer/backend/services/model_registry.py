@@ -0,0 +1,142 @@
+import os
+import time
+import calendar
+from threading import Lock
+from config import config
+
+def parse_metadata_header(content: str) -> dict:
+    """Parse the `key: value` lines of a `---` metadata header, if present"""
+    metadata = {}
+    if not content.startswith("---"):
+        return metadata
+
+    parts = content.split("---", 2)
+    if len(parts) < 3:
+        return metadata
+
+    for line in parts[1].strip().split('\n'):
+        key, sep, value = line.partition(':')
+        if sep:
+            metadata[key.strip()] = value.strip()
+
+    return metadata
+
+class ModelRegistry:
+    """
+    In-memory index of saved style models so listing never reads whole model files.
+
+    The index is reconciled with the models directory on every listing: the
+    directory is scanned and only new or changed files (by mtime and size)
+    have their headers re-read, and deleted files are dropped. Several
+    uvicorn workers sharing MODELS_DIR therefore all see models saved or
+    deleted by any one of them.
+    """
+
+    def __init__(self, models_dir: str):
+        self.models_dir = models_dir
+        self._models: dict[str, dict] = {}
+        self._lock = Lock()
+
+    def rebuild(self) -> int:
+        """
+        Rebuild the index by scanning the models directory.
+
+        Returns:
+            int: Number of models indexed
+        """
+        with self._lock:
+            self._models = {}
+            self._reconcile()
+            return len(self._models)
+
+    def upsert(self, model_name: str):
+        """Add or refresh a model entry after its file has been written"""
+        entry = self._build_entry(model_name)
+        with self._lock:
+            self._models[model_name] = entry
+
+    def remove(self, model_name: str):
+        """Remove a model entry after its file has been deleted"""
+        with self._lock:
+            self._models.pop(model_name, None)
+
+    def list(self, offset: int = 0, limit: int | None = None) -> list[dict]:
+        """
+        List indexed models, newest first.
+
+        Args:
+            offset: Number of models to skip
+            limit: Maximum number of models to return (None for all)
+
+        Returns:
+            list: Model entries (name, created_at, size, file_path, metadata)
+        """
+        with self._lock:
+            self._reconcile()
+            models = sorted(self._models.values(), key=lambda m: m["created_at"], reverse=True)
+
+        end = None if limit is None else offset + limit
+        return models[offset:end]
+
+    def count(self) -> int:
+        """Number of indexed models"""
+        with self._lock:
+            self._reconcile()
+            return len(self._models)
+
+    def _reconcile(self):
+        """Sync the index with the models directory, re-reading only changed files (caller holds the lock)"""
+        if not os.path.exists(self.models_dir):
+            self._models = {}
+            return
+
+        seen = set()
+        with os.scandir(self.models_dir) as entries:
+            for dir_entry in entries:
+                filename = dir_entry.name
+                if not filename.endswith('.md') or filename.startswith('temp_'):
+                    continue
+
+                model_name = filename[:-3]  # Remove .md extension
+                try:
+                    stat_info = dir_entry.stat()
+                    current = self._models.get(model_name)
+                    if (current is None or current["modified_at"] != stat_info.st_mtime
+                            or current["size"] != stat_info.st_size):
+                        self._models[model_name] = self._build_entry(model_name)
+                except FileNotFoundError:
+                    continue  # Deleted while scanning
+                seen.add(model_name)
+
+        for model_name in self._models.keys() - seen:
+            del self._models[model_name]
+
+    def _build_entry(self, model_name: str) -> dict:
+        """Stat and read the header of a model file to build its index entry"""
+        file_path = os.path.join(self.models_dir, f"{model_name}.md")
+        stat_info = os.stat(file_path)
+
+        # Only the header is needed, not the whole report
+        with open(file_path, 'r', encoding='utf-8') as f:
+            head = f.read(1024)
+        metadata = parse_metadata_header(head)
+
+        # Prefer the timestamp written by save_model, fall back to the file time
+        created_at = stat_info.st_ctime
+        if 'created_at' in metadata:
+            try:
+                created_at = calendar.timegm(time.strptime(metadata['created_at'], "%Y-%m-%dT%H:%M:%SZ"))
+            except ValueError:
+                pass
+
+        return {
+            "name": model_name,
+            "created_at": created_at,
+            "size": stat_info.st_size,
+            "modified_at": stat_info.st_mtime,
+            "file_path": file_path,
+            "metadata": metadata
+        }
+
+# Shared by StyleActor (list/delete) and StyleLearner (save)
+model_registry = ModelRegistry(config.MODELS_DIR)
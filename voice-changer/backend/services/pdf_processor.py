@@ -1,108 +1,264 @@
+import os
+import mmap
+import asyncio
+import multiprocessing
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import AsyncIterator
 import pdfplumber
 from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
 from collections import Counter
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from services.metrics import pdf_stage_duration, current_labels
+
+SCANNED_PDF_ERROR = "This PDF appears to be scanned images. Please use a text-based PDF."
+
+class PDFValidationError(Exception):
+    """Raised when an uploaded PDF cannot be processed"""
+
+def iter_page_texts(pdf, start: int = 0, end: int | None = None):
+    """
+    Lazily yield the text of pages [start, end) of an open pdfplumber PDF.
+
+    Pages without text yield "". Each page's parsed objects are released as
+    soon as its text has been extracted, so memory stays flat on long documents.
+    """
+    end = len(pdf.pages) if end is None else min(end, len(pdf.pages))
+    for index in range(start, end):
+        page = pdf.pages[index]
+        try:
+            yield page.extract_text() or ""
+        finally:
+            page.close()
+
+@contextmanager
+def open_mapped_pdf(file_path: str):
+    """
+    Open a PDF file with pdfplumber through a read-only memory map.
+
+    Pages are read straight from the OS page cache instead of through a
+    private in-memory copy of the file, so workers parsing the same file
+    share its memory.
+    """
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with pdfplumber.open(mapped) as pdf:
+            yield pdf
+
+def _count_pages_in_worker(file_path: str) -> int:
+    """Process-pool entry point: number of pages in a PDF file"""
+    with open_mapped_pdf(file_path) as pdf:
+        return len(pdf.pages)
+
+def _extract_page_range_in_worker(file_path: str, start: int, end: int) -> list[str]:
+    """Process-pool entry point: text of pages [start, end) of a PDF file"""
+    with open_mapped_pdf(file_path) as pdf:
+        return list(iter_page_texts(pdf, start, end))
+
+@lru_cache(maxsize=1)
+def _body_style() -> ParagraphStyle:
+    """The CustomBody paragraph style, built once per process along with its font metrics"""
+    styles = getSampleStyleSheet()
+    style = ParagraphStyle(name='CustomBody',
+                           parent=styles['BodyText'],
+                           fontSize=11,
+                           leading=16,
+                           spaceBefore=6,
+                           spaceAfter=6)
+    pdfmetrics.getFont(style.fontName)
+    return style
+
+def _render_pdf(text: str, output):
+    """Lay out the paragraphs of text as a PDF written to `output` (a path or binary file)"""
+    doc = SimpleDocTemplate(output, pagesize=letter,
+                            rightMargin=72, leftMargin=72,
+                            topMargin=72, bottomMargin=18)
+    style = _body_style()
+
+    # Container for the 'Flowable' objects
+    elements = []
+    for para_text in text.split('\n\n'):
+        if para_text.strip():
+            # Clean the text for reportlab
+            clean_text = para_text.replace('<', '&lt;').replace('>', '&gt;')
+            elements.append(Paragraph(clean_text, style))
+            elements.append(Spacer(1, 0.1 * inch))
+
+    doc.build(elements)
+
+def _render_pdf_in_worker(text: str, output_path: str | None) -> bytes | None:
+    """Process-pool entry point: render text to a PDF file, or return the PDF bytes"""
+    if output_path is not None:
+        _render_pdf(text, output_path)
+        return None
+
+    buffer = BytesIO()
+    _render_pdf(text, buffer)
+    return buffer.getvalue()
 
 class PDFProcessor:
     """Service for processing PDF files"""
 
-    def __init__(self, max_file_size_mb=10):
+    def __init__(self, max_file_size_mb=10, max_workers=None, pages_per_task=25):
         self.max_file_size_mb = max_file_size_mb
         self.max_file_size_bytes = max_file_size_mb * 1024 * 1024
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pages_per_task = max(1, pages_per_task)
+        self._pool = None
 
-    def validate_pdf(self, file_content: bytes) -> dict:
+    async def process_pdf_file_async(self, file_path: str) -> dict:
         """
-        Validate if PDF is processable
+        Validate and extract a PDF file, splitting its pages across the process pool.
+
+        Parsing is CPU-bound, so it runs in a process pool sized to the host's
+        cores instead of on the event loop. The page count is read first, then
+        documents longer than `pages_per_task` pages are split into page
+        ranges that are extracted in parallel and reassembled in order. Each
+        worker task opens the file itself (through a memory map), so the
+        document is opened once for the count plus once per range.
 
         Returns:
             dict: {
                 "valid": bool,
                 "error": str or None,
                 "has_text": bool,
-                "pages": int
+                "pages": int,
+                "text": str,
+                "paragraphs": list[str]
             }
         """
-        # Check file size
-        if len(file_content) > self.max_file_size_bytes:
-            return {
-                "valid": False,
-                "error": f"File exceeds {self.max_file_size_mb}MB limit",
-                "has_text": False,
-                "pages": 0
-            }
+        if os.path.getsize(file_path) > self.max_file_size_bytes:
+            return self._invalid(f"File exceeds {self.max_file_size_mb}MB limit")
 
+        pool = self._get_pool()
+        loop = asyncio.get_running_loop()
         try:
-            with pdfplumber.open(BytesIO(file_content)) as pdf:
-                pages = len(pdf.pages)
-
-                # Check if PDF has extractable text (not just scanned images)
-                has_text = False
-                for page in pdf.pages[:min(3, pages)]:  # Check first 3 pages
-                    text = page.extract_text()
-                    if text and len(text.strip()) > 50:  # At least 50 chars
-                        has_text = True
-                        break
-
-                if not has_text:
-                    return {
-                        "valid": False,
-                        "error": "This PDF appears to be scanned images. Please use a text-based PDF.",
-                        "has_text": False,
-                        "pages": pages
-                    }
-
-                return {
-                    "valid": True,
-                    "error": None,
-                    "has_text": True,
-                    "pages": pages
-                }
-
+            with pdf_stage_duration.time(stage="validate", **current_labels()):
+                pages = await loop.run_in_executor(pool, _count_pages_in_worker, file_path)
+
+            ranges = [
+                (start, min(start + self.pages_per_task, pages))
+                for start in range(0, pages, self.pages_per_task)
+            ]
+            with pdf_stage_duration.time(stage="extract", **current_labels()):
+                chunks = await asyncio.gather(*(
+                    loop.run_in_executor(pool, _extract_page_range_in_worker, file_path, start, end)
+                    for start, end in ranges
+                ))
         except Exception as e:
-            return {
-                "valid": False,
-                "error": f"Unable to read PDF file: {str(e)}",
-                "has_text": False,
-                "pages": 0
-            }
+            return self._invalid(f"Unable to read PDF file: {str(e)}")
 
-    def extract_text_with_structure(self, file_content: bytes) -> dict:
-        """
-        Extract text from PDF with structure preservation
+        return self._build_result([text for chunk in chunks for text in chunk], pages)
 
-        Returns:
-            dict: {
-                "text": str,
-                "pages": int,
-                "paragraphs": list[str]
-            }
+    async def iter_paragraph_chunks_async(self, file_path: str) -> AsyncIterator[list[str]]:
         """
-        with pdfplumber.open(BytesIO(file_content)) as pdf:
-            pages_text = []
+        Extract a PDF file progressively, yielding its paragraphs one page range at a time.
 
-            # Extract text from each page
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    pages_text.append(text)
+        All page ranges are submitted to the process pool up front and yielded
+        in document order as they complete, so callers can start working on the
+        first pages while later ones are still being parsed. Repeated
+        headers/footers are detected within each page range rather than across
+        the whole document. The file must exist until iteration finishes.
 
-            # Detect and remove repeated headers/footers
-            cleaned_pages = self._remove_repeated_elements(pages_text)
+        Raises:
+            PDFValidationError: If the file is too large, unreadable, or has no
+                text on its first pages (raised before the first chunk)
+        """
+        if os.path.getsize(file_path) > self.max_file_size_bytes:
+            raise PDFValidationError(f"File exceeds {self.max_file_size_mb}MB limit")
 
-            # Join pages with double newline
-            full_text = "\n\n".join(cleaned_pages)
+        pool = self._get_pool()
+        loop = asyncio.get_running_loop()
+        try:
+            with pdf_stage_duration.time(stage="validate", **current_labels()):
+                pages = await loop.run_in_executor(pool, _count_pages_in_worker, file_path)
+        except Exception as e:
+            raise PDFValidationError(f"Unable to read PDF file: {str(e)}")
 
-            # Split into paragraphs
-            paragraphs = self._split_into_paragraphs(full_text)
+        if pages == 0:
+            raise PDFValidationError(SCANNED_PDF_ERROR)
 
-            return {
-                "text": full_text,
-                "pages": len(pdf.pages),
-                "paragraphs": paragraphs
-            }
+        futures = [
+            loop.run_in_executor(pool, _extract_page_range_in_worker, file_path, start,
+                                 min(start + self.pages_per_task, pages))
+            for start in range(0, pages, self.pages_per_task)
+        ]
+        try:
+            for index, future in enumerate(futures):
+                try:
+                    page_texts = await future
+                except Exception as e:
+                    raise PDFValidationError(f"Unable to read PDF file: {str(e)}")
+
+                if index == 0 and not self._has_text(page_texts):
+                    raise PDFValidationError(SCANNED_PDF_ERROR)
+
+                cleaned_pages = self._remove_repeated_elements([text for text in page_texts if text])
+                yield self._split_into_paragraphs("\n\n".join(cleaned_pages))
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """
+        The worker process pool, started on first use.
+
+        By then the server has worker threads and open SQLite connections, so
+        workers are not forked from it directly: they come from a forkserver
+        (or are spawned where that is unavailable).
+        """
+        if self._pool is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(start_method)
+            )
+        return self._pool
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _has_text(self, page_texts: list[str]) -> bool:
+        """Check if PDF has extractable text (not just scanned images) on its first 3 pages"""
+        return any(len(text.strip()) > 50 for text in page_texts[:3])  # At least 50 chars
+
+    def _build_result(self, page_texts: list[str], pages: int) -> dict:
+        """Validate and structure the per-page text of a document"""
+        if not self._has_text(page_texts):
+            return self._invalid(SCANNED_PDF_ERROR, pages=pages)
+
+        # Detect and remove repeated headers/footers
+        cleaned_pages = self._remove_repeated_elements([text for text in page_texts if text])
+
+        # Join pages with double newline
+        full_text = "\n\n".join(cleaned_pages)
+
+        return {
+            "valid": True,
+            "error": None,
+            "has_text": True,
+            "pages": pages,
+            "text": full_text,
+            "paragraphs": self._split_into_paragraphs(full_text)
+        }
+
+    def _invalid(self, error: str, pages: int = 0) -> dict:
+        """Result for a PDF that failed validation"""
+        return {
+            "valid": False,
+            "error": error,
+            "has_text": False,
+            "pages": pages,
+            "text": "",
+            "paragraphs": []
+        }
 
     def _remove_repeated_elements(self, pages_text: list[str]) -> list[str]:
         """
@@ -185,36 +341,27 @@ class PDFProcessor:
             BytesIO: PDF file content
         """
         buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter,
-                                rightMargin=72, leftMargin=72,
-                                topMargin=72, bottomMargin=18)
-
-        # Container for the 'Flowable' objects
-        elements = []
-
-        # Define styles
-        styles = getSampleStyleSheet()
-        styles.add(ParagraphStyle(name='CustomBody',
-                                   parent=styles['BodyText'],
-                                   fontSize=11,
-                                   leading=16,
-                                   spaceBefore=6,
-                                   spaceAfter=6))
-
-        # Split text into paragraphs
-        paragraphs = text.split('\n\n')
-
-        for para_text in paragraphs:
-            if para_text.strip():
-                # Clean the text for reportlab
-                clean_text = para_text.replace('<', '&lt;').replace('>', '&gt;')
-
-                # Create paragraph
-                para = Paragraph(clean_text, styles['CustomBody'])
-                elements.append(para)
-                elements.append(Spacer(1, 0.1 * inch))
-
-        # Build PDF
-        doc.build(elements)
+        with pdf_stage_duration.time(stage="generate", **current_labels()):
+            _render_pdf(text, buffer)
         buffer.seek(0)
         return buffer
+
+    async def generate_pdf_async(self, text: str, output_path: str | None = None) -> BytesIO | None:
+        """
+        Generate a PDF from transformed text in the process pool.
+
+        Layout is CPU-bound, so long documents are rendered in a worker
+        process instead of blocking the event loop.
+
+        Args:
+            text: The transformed text
+            output_path: Write the PDF straight to this file instead of
+                returning it, so it is never held in this process's memory
+
+        Returns:
+            BytesIO or None: PDF file content, or None when written to output_path
+        """
+        loop = asyncio.get_running_loop()
+        with pdf_stage_duration.time(stage="generate", **current_labels()):
+            content = await loop.run_in_executor(self._get_pool(), _render_pdf_in_worker, text, output_path)
+        return None if content is None else BytesIO(content)
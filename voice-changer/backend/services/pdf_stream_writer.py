@@ -0,0 +1,155 @@
+import zlib
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import simpleSplit
+
+FONT_NAME = "Helvetica"
+
+class StreamingPDFWriter:
+    """
+    Minimal incremental PDF writer for plain paragraphs.
+
+    Unlike reportlab's document templates, which need every flowable before
+    building, this writer emits each page's bytes as soon as the page is full.
+    The page tree, cross-reference table and trailer are written by close().
+    Layout mirrors the CustomBody style used by PDFProcessor.generate_pdf.
+    """
+
+    # Object numbers reserved up front
+    CATALOG_ID = 1
+    PAGES_ID = 2
+    FONT_ID = 3
+
+    def __init__(self, pagesize=letter, left_margin=72, right_margin=72, top_margin=72,
+                 bottom_margin=18, font_size=11, leading=16, space_before=6, space_after=6,
+                 paragraph_gap=7.2):
+        self.page_width, self.page_height = pagesize
+        self.left_margin = left_margin
+        self.text_width = self.page_width - left_margin - right_margin
+        self.top = self.page_height - top_margin
+        self.bottom = bottom_margin
+        self.font_size = font_size
+        self.leading = leading
+        self.space_before = space_before
+        self.space_after = space_after
+        self.paragraph_gap = paragraph_gap
+
+        self._offset = 0
+        self._xref: dict[int, int] = {}
+        self._next_id = self.FONT_ID + 1
+        self._page_ids: list[int] = []
+        self._lines: list[bytes] = []
+        self._y = self.top
+        self._started = False
+        self._closed = False
+
+    def add_paragraph(self, text: str) -> bytes:
+        """
+        Lay out a paragraph.
+
+        Returns:
+            bytes: PDF bytes for any pages completed by this paragraph
+                (plus the file header on the first call)
+        """
+        out = [self._start()]
+        text = " ".join(text.split())
+        if not text:
+            return b"".join(out)
+
+        if self._lines:
+            self._y -= self.space_before
+
+        for line in simpleSplit(text, FONT_NAME, self.font_size, self.text_width):
+            if self._y - self.leading < self.bottom:
+                out.append(self._finish_page())
+            self._y -= self.leading
+            self._lines.append(self._text_op(line))
+
+        self._y -= self.space_after + self.paragraph_gap
+        return b"".join(out)
+
+    def close(self) -> bytes:
+        """Finish the last page and write the page tree, xref table and trailer"""
+        if self._closed:
+            return b""
+        out = [self._start()]
+        if self._lines or not self._page_ids:
+            out.append(self._finish_page())
+
+        kids = " ".join(f"{page_id} 0 R" for page_id in self._page_ids)
+        out.append(self._object(
+            self.PAGES_ID,
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>".encode("ascii")
+        ))
+
+        xref_offset = self._offset
+        size = self._next_id
+        xref = [f"xref\n0 {size}\n".encode("ascii"), b"0000000000 65535 f \n"]
+        for object_id in range(1, size):
+            xref.append(f"{self._xref[object_id]:010d} 00000 n \n".encode("ascii"))
+        xref.append(
+            f"trailer\n<< /Size {size} /Root {self.CATALOG_ID} 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+            .encode("ascii")
+        )
+        out.append(self._emit(b"".join(xref)))
+        self._closed = True
+        return b"".join(out)
+
+    def _start(self) -> bytes:
+        """File header, catalog and font (written once)"""
+        if self._started:
+            return b""
+        self._started = True
+        return b"".join([
+            self._emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"),
+            self._object(self.CATALOG_ID, f"<< /Type /Catalog /Pages {self.PAGES_ID} 0 R >>".encode("ascii")),
+            self._object(
+                self.FONT_ID,
+                f"<< /Type /Font /Subtype /Type1 /BaseFont /{FONT_NAME} /Encoding /WinAnsiEncoding >>".encode("ascii")
+            )
+        ])
+
+    def _finish_page(self) -> bytes:
+        """Write the current page's content stream and page object"""
+        content = zlib.compress(b"BT\n" + b"".join(self._lines) + b"ET\n")
+        content_id = self._allocate()
+        page_id = self._allocate()
+        self._page_ids.append(page_id)
+        self._lines = []
+        self._y = self.top
+
+        return b"".join([
+            self._object(
+                content_id,
+                f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode("ascii")
+                + content + b"\nendstream"
+            ),
+            self._object(
+                page_id,
+                (
+                    f"<< /Type /Page /Parent {self.PAGES_ID} 0 R "
+                    f"/MediaBox [0 0 {self.page_width:.2f} {self.page_height:.2f}] "
+                    f"/Resources << /Font << /F1 {self.FONT_ID} 0 R >> >> "
+                    f"/Contents {content_id} 0 R >>"
+                ).encode("ascii")
+            )
+        ])
+
+    def _text_op(self, line: str) -> bytes:
+        """Text-showing operators for one line at the current position"""
+        encoded = line.encode("cp1252", errors="replace")
+        escaped = encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+        position = f"/F1 {self.font_size} Tf 1 0 0 1 {self.left_margin:.2f} {self._y:.2f} Tm (".encode("ascii")
+        return position + escaped + b") Tj\n"
+
+    def _allocate(self) -> int:
+        object_id = self._next_id
+        self._next_id += 1
+        return object_id
+
+    def _object(self, object_id: int, body: bytes) -> bytes:
+        self._xref[object_id] = self._offset
+        return self._emit(f"{object_id} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+
+    def _emit(self, data: bytes) -> bytes:
+        self._offset += len(data)
+        return data
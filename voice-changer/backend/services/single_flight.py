@@ -0,0 +1,69 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+from services.llm_scheduler import current_llm_priority
+
+class _Call:
+    """An in-flight upstream call and the number of callers waiting on it"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Collapses concurrent identical calls onto one upstream call.
+
+    The first caller for a key starts the call; callers arriving with the same
+    key while it is running wait for the same result, or the same exception.
+    A caller that is cancelled stops waiting without affecting the others, and
+    the upstream call is cancelled once no caller is left waiting for it.
+
+    The upstream call runs in its starting caller's context, so it is queued
+    at that caller's LLM priority. A caller therefore only joins a call
+    started at the same or a more urgent priority; an interactive request
+    never waits behind bulk PDF work, it starts its own call instead.
+    """
+
+    def __init__(self):
+        self._calls: dict[tuple[Hashable, int], _Call] = {}
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run factory() for this key, or join the identical call already in flight.
+
+        Args:
+            key: Identifies identical requests
+            factory: Starts the upstream call (only invoked if none is in flight)
+
+        Returns:
+            The upstream call's result
+        """
+        priority = current_llm_priority()
+        # Join the most urgent identical call that is at least as urgent as this caller
+        slot = next(
+            ((key, p) for p in range(priority + 1) if (key, p) in self._calls),
+            (key, priority)
+        )
+        call = self._calls.get(slot)
+        if call is None:
+            call = _Call(asyncio.ensure_future(factory()))
+            self._calls[slot] = call
+            call.task.add_done_callback(lambda _: self._forget(slot, call))
+
+        call.waiters += 1
+        try:
+            # shield() keeps one waiter's cancellation from cancelling the shared call
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+                self._forget(slot, call)
+
+    def in_flight(self) -> int:
+        """Number of distinct upstream calls currently running"""
+        return len(self._calls)
+
+    def _forget(self, slot: tuple[Hashable, int], call: _Call):
+        if self._calls.get(slot) is call:
+            del self._calls[slot]
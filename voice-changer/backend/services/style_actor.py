@@ -1,15 +1,44 @@
 import os
-from openai import OpenAI
+import time
+import re
+import hashlib
+import asyncio
+from typing import AsyncIterator, Callable
+from openai import AsyncOpenAI
 from config import config
+from services.style_report_cache import style_report_cache
+from services.model_registry import model_registry
+from services.transform_cache import transform_cache
+from services.checkpoint_store import checkpoint_store
+from services.tokens import estimate_tokens
+from services.usage_tracker import usage_tracker
+from services.single_flight import SingleFlight
+from services.llm_scheduler import llm_scheduler
+from services.llm_client import get_llm_client
+from services.metrics import model_label, style_report_load_duration, cache_lookups, current_labels
+
+ACTOR_INSTRUCTIONS = "You are a text style transformer. Your job is to rewrite text to match a specific style accurately."
+
+# Marker placed before each paragraph in a packed request, e.g. "<<<P3>>>"
+PACKED_MARKER = "<<<P{index}>>>"
+PACKED_MARKER_PATTERN = re.compile(r"^[ \t]*<<<P(\d+)>>>[ \t]*$", re.MULTILINE)
+
+def _raise_first_error(results: list):
+    """Re-raise the first exception captured by asyncio.gather(return_exceptions=True)"""
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
 
 class StyleActor:
     """Service for transforming text using learned style reports"""
 
-    def __init__(self):
-        self.client = OpenAI(api_key=config.OPENAI_API_KEY)
+    def __init__(self, client: AsyncOpenAI | None = None):
+        self.client = client or get_llm_client()
         self.model_name = config.MODEL_NAME
+        # Identical prompts in flight at the same time share one API call
+        self._single_flight = SingleFlight()
 
-    def transform_text(self, model_name: str, input_text: str) -> str:
+    async def transform_text(self, model_name: str, input_text: str) -> str:
         """
         Transform input text using a trained style model.
 
@@ -20,56 +49,334 @@ class StyleActor:
         Returns:
             str: The transformed text
         """
-        # Load the style report
-        style_report = self._load_style_report(model_name)
+        with model_label(model_name):
+            # Load the style report
+            style_report = self._load_style_report(model_name)
 
-        # Create the transformation prompt
-        prompt = self._create_actor_prompt(style_report, input_text)
+            return await self.transform_with_style_report(style_report, input_text, model_name)
+
+    async def transform_paragraphs(self, model_name: str, paragraphs: list[str],
+                                   max_concurrency: int | None = None,
+                                   on_result: Callable[[int, str], None] | None = None,
+                                   semaphore: asyncio.Semaphore | None = None) -> list[str]:
+        """
+        Transform a list of independent paragraphs concurrently.
+
+        Args:
+            model_name: The name of the style model to use
+            paragraphs: The paragraphs to transform
+            max_concurrency: Maximum number of in-flight LLM calls
+                (defaults to PDF_TRANSFORM_CONCURRENCY)
+            on_result: Called with (index, transformed_text) as each paragraph finishes
+            semaphore: Shared semaphore bounding in-flight calls across several
+                invocations (overrides max_concurrency)
 
-        # Call OpenAI API using Responses API (for GPT-5)
-        response = self.client.responses.create(
-            model=self.model_name,
-            instructions="You are a text style transformer. Your job is to rewrite text to match a specific style accurately.",
-            input=prompt
+        Returns:
+            list: Transformed paragraphs, in the same order as the input
+        """
+        if semaphore is None:
+            limit = max(1, max_concurrency or config.PDF_TRANSFORM_CONCURRENCY)
+            semaphore = asyncio.Semaphore(limit)
+
+        async def transform_one(index: int, paragraph: str) -> str:
+            async with semaphore:
+                transformed = await self.transform_text(model_name, paragraph)
+            if on_result:
+                on_result(index, transformed)
+            return transformed
+
+        # gather() keeps results in input order. Let every paragraph finish (and be
+        # reported through on_result) before surfacing the first failure.
+        results = await asyncio.gather(
+            *(transform_one(i, p) for i, p in enumerate(paragraphs)),
+            return_exceptions=True
         )
+        _raise_first_error(results)
+        return list(results)
 
-        # Extract and return the transformed text
-        transformed_text = response.output_text.strip()
-        return transformed_text
+    async def transform_paragraphs_packed(self, model_name: str, paragraphs: list[str],
+                                          token_budget: int | None = None,
+                                          max_concurrency: int | None = None,
+                                          on_result: Callable[[int, str], None] | None = None) -> list[str]:
+        """
+        Transform paragraphs by packing several of them into each LLM request.
+
+        Paragraphs are grouped until the estimated input size reaches the token
+        budget, so the style guide is sent once per batch instead of once per
+        paragraph. Batches whose output cannot be split back into the expected
+        number of paragraphs fall back to one call per paragraph.
+
+        Args:
+            model_name: The name of the style model to use
+            paragraphs: The paragraphs to transform
+            token_budget: Estimated paragraph tokens per request
+                (defaults to PDF_PACK_TOKEN_BUDGET)
+            max_concurrency: Maximum number of in-flight LLM calls
+                (defaults to PDF_TRANSFORM_CONCURRENCY)
+            on_result: Called with (index, transformed_text) as each paragraph finishes
 
-    def transform_with_style_report(self, style_report: str, input_text: str) -> str:
+        Returns:
+            list: Transformed paragraphs, in the same order as the input
+        """
+        style_report = self._load_style_report(model_name)
+
+        # Only paragraphs missing from the result cache are sent to the model
+        cache_keys = [transform_cache.make_key(self.model_name, style_report, p) for p in paragraphs]
+        with model_label(model_name):
+            results: list[str | None] = await transform_cache.get_many_async(cache_keys)
+        pending = [i for i, result in enumerate(results) if result is None]
+
+        if on_result:
+            for i, result in enumerate(results):
+                if result is not None:
+                    on_result(i, result)
+
+        batches = self._pack_paragraphs([paragraphs[i] for i in pending],
+                                        token_budget or config.PDF_PACK_TOKEN_BUDGET)
+
+        limit = max(1, max_concurrency or config.PDF_TRANSFORM_CONCURRENCY)
+        semaphore = asyncio.Semaphore(limit)
+
+        async def transform_single(paragraph: str) -> str:
+            async with semaphore:
+                return await self._complete(self._create_actor_prompt(style_report, paragraph),
+                                            style_report, model_name)
+
+        async def transform_batch(indices: list[int], batch: list[str]):
+            transformed = None
+            if len(batch) > 1:
+                async with semaphore:
+                    output = await self._complete(self._create_packed_actor_prompt(style_report, batch),
+                                                  style_report, model_name, "actor.transform_packed")
+                transformed = self._split_packed_output(output, len(batch))
+
+            if transformed is None:
+                # Single paragraph, or the packed response could not be parsed
+                transformed = await asyncio.gather(*(transform_single(p) for p in batch))
+
+            for i, text in zip(indices, transformed):
+                results[i] = text
+                await transform_cache.put_async(cache_keys[i], text)
+                if on_result:
+                    on_result(i, text)
+
+        # Batches are consecutive runs of the pending paragraphs
+        batch_indices = []
+        start = 0
+        for batch in batches:
+            batch_indices.append(pending[start:start + len(batch)])
+            start += len(batch)
+
+        outcomes = await asyncio.gather(
+            *(transform_batch(indices, batch) for indices, batch in zip(batch_indices, batches)),
+            return_exceptions=True
+        )
+        _raise_first_error(outcomes)
+        return results
+
+    async def transform_document(self, model_name: str, paragraphs: list[str], document_hash: str,
+                                 pack_paragraphs: bool = False,
+                                 on_progress: Callable[[int, int], None] | None = None) -> dict:
+        """
+        Transform a document's paragraphs with per-paragraph checkpointing.
+
+        Finished paragraphs are saved to the checkpoint store as they complete,
+        so calling this again for the same (document_hash, model_name) only
+        transforms the paragraphs that are still missing.
+
+        Args:
+            model_name: The name of the style model to use
+            paragraphs: The document's paragraphs
+            document_hash: Hash of the source document
+            pack_paragraphs: Use packed multi-paragraph requests
+            on_progress: Called with (paragraphs_done, paragraphs_total) as paragraphs finish
+
+        Returns:
+            dict: {"paragraphs": list[str], "resumed": int}
+        """
+        style_report = self._load_style_report(model_name)
+        report_hash = hashlib.sha256(style_report.encode('utf-8')).hexdigest()
+        completed = await asyncio.to_thread(
+            checkpoint_store.start, document_hash, model_name, len(paragraphs), report_hash
+        )
+
+        missing = [i for i in range(len(paragraphs)) if i not in completed]
+        done = len(paragraphs) - len(missing)
+        if on_progress:
+            on_progress(done, len(paragraphs))
+
+        # Finished paragraphs are written by a single background flusher: whatever
+        # finishes while one batch is being written goes into the next batch
+        unsaved: list[tuple[int, str]] = []
+        flusher: asyncio.Task | None = None
+
+        async def flush_checkpoints():
+            while unsaved:
+                batch = unsaved[:]
+                unsaved.clear()
+                await asyncio.to_thread(checkpoint_store.save_many, document_hash, model_name, batch)
+
+        def save_checkpoint(index: int, text: str):
+            nonlocal done, flusher
+            unsaved.append((missing[index], text))
+            if flusher is None or flusher.done():
+                flusher = asyncio.create_task(flush_checkpoints())
+            done += 1
+            if on_progress:
+                on_progress(done, len(paragraphs))
+
+        transform = self.transform_paragraphs_packed if pack_paragraphs else self.transform_paragraphs
+        try:
+            transformed = await transform(
+                model_name,
+                [paragraphs[i] for i in missing],
+                on_result=save_checkpoint
+            )
+        finally:
+            # Make sure everything finished so far is saved, even on failure
+            if flusher is not None:
+                await flusher
+            await flush_checkpoints()
+
+        results = [completed.get(i) for i in range(len(paragraphs))]
+        for i, text in zip(missing, transformed):
+            results[i] = text
+
+        return {
+            "paragraphs": results,
+            "resumed": len(paragraphs) - len(missing)
+        }
+
+    async def transform_with_style_report(self, style_report: str, input_text: str,
+                                          model_name: str | None = None) -> str:
         """
         Transform input text using a provided style report (without requiring a saved model).
 
         Args:
             style_report: The style guide content as a string
             input_text: The text to transform
+            model_name: Style model the report belongs to, used for usage accounting
 
         Returns:
             str: The transformed text
         """
+        # Identical (LLM model, style report, input) requests are served from cache
+        cache_key = transform_cache.make_key(self.model_name, style_report, input_text)
+        cached = await transform_cache.get_async(cache_key)
+        if cached is not None:
+            return cached
+
         # Create the transformation prompt directly from the provided style report
         prompt = self._create_actor_prompt(style_report, input_text)
 
-        # Call OpenAI API using Responses API
-        response = self.client.responses.create(
-            model=self.model_name,
-            instructions=(
-                "You are a text style transformer. Your job is to rewrite text to match a specific style accurately."
-            ),
-            input=prompt,
-        )
-
-        transformed_text = response.output_text.strip()
+        transformed_text = await self._complete(prompt, style_report, model_name)
+        await transform_cache.put_async(cache_key, transformed_text)
         return transformed_text
 
+    async def stream_transform_text(self, model_name: str, input_text: str) -> AsyncIterator[str]:
+        """
+        Transform input text using a trained style model, streaming the output.
+
+        The style report is loaded before the stream is returned, so a missing
+        model raises FileNotFoundError here rather than mid-stream.
+
+        Args:
+            model_name: The name of the style model to use
+            input_text: The text to transform
+
+        Returns:
+            AsyncIterator: Yields text deltas as the model produces them
+        """
+        style_report = self._load_style_report(model_name)
+        cache_key = transform_cache.make_key(self.model_name, style_report, input_text)
+        with model_label(model_name):
+            cached = await transform_cache.get_async(cache_key)
+
+        async def deltas() -> AsyncIterator[str]:
+            if cached is not None:
+                yield cached
+                return
+
+            prompt = self._create_actor_prompt(style_report, input_text)
+            stream = await llm_scheduler.run(
+                lambda: self.client.responses.create(
+                    model=self.model_name,
+                    instructions=ACTOR_INSTRUCTIONS,
+                    input=prompt,
+                    stream=True,
+                    extra_body={"prompt_cache_key": self._prompt_cache_key(style_report)}
+                ),
+                estimated_tokens=estimate_tokens(prompt),
+                operation="actor.stream",
+                model_name=model_name
+            )
+
+            chunks = []
+            async for event in stream:
+                if event.type == "response.output_text.delta":
+                    # Leading whitespace is dropped, as in the non-streaming path
+                    delta = event.delta if chunks else event.delta.lstrip()
+                    if delta:
+                        chunks.append(delta)
+                        yield delta
+                elif event.type == "response.completed":
+                    usage_tracker.record("actor.stream", model_name, event.response.usage)
+
+            await transform_cache.put_async(cache_key, "".join(chunks).strip())
+
+        return deltas()
+
+    async def _complete(self, prompt: str, style_report: str, model_name: str | None = None,
+                        operation: str = "actor.transform") -> str:
+        """Send an actor prompt to the model and return the stripped output"""
+        async def call() -> str:
+            # Call OpenAI API using Responses API (for GPT-5)
+            response = await llm_scheduler.run(
+                lambda: self.client.responses.create(
+                    model=self.model_name,
+                    instructions=ACTOR_INSTRUCTIONS,
+                    input=prompt,
+                    extra_body={"prompt_cache_key": self._prompt_cache_key(style_report)}
+                ),
+                estimated_tokens=estimate_tokens(prompt),
+                operation=operation,
+                model_name=model_name
+            )
+            usage_tracker.record(operation, model_name, response.usage)
+
+            # Extract and return the transformed text
+            transformed_text = response.output_text.strip()
+            return transformed_text
+
+        key = (self.model_name, hashlib.sha256(prompt.encode('utf-8')).hexdigest())
+        return await self._single_flight.run(key, call)
+
+    def _prompt_cache_key(self, style_report: str) -> str:
+        """Routing hint so requests sharing a style prefix land on the same prompt cache"""
+        return "style-" + hashlib.sha256(style_report.encode('utf-8')).hexdigest()[:32]
+
+    def has_model(self, model_name: str) -> bool:
+        """Check whether a style model exists on disk"""
+        return os.path.exists(os.path.join(config.MODELS_DIR, f"{model_name}.md"))
+
     def _load_style_report(self, model_name: str) -> str:
-        """Load a style report from disk"""
+        """Load a style report, from the in-memory cache when the file is unchanged"""
+        started = time.perf_counter()
         file_path = os.path.join(config.MODELS_DIR, f"{model_name}.md")
 
-        if not os.path.exists(file_path):
+        try:
+            mtime_ns = os.stat(file_path).st_mtime_ns
+        except FileNotFoundError:
+            style_report_cache.invalidate(model_name)
             raise FileNotFoundError(f"Model '{model_name}' not found")
 
+        labels = current_labels(model_name)
+        cached = style_report_cache.get(model_name, mtime_ns)
+        if cached is not None:
+            cache_lookups.inc(cache="style_report", result="hit", **labels)
+            style_report_load_duration.observe(time.perf_counter() - started, source="cache", **labels)
+            return cached
+
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
 
@@ -79,71 +386,108 @@ class StyleActor:
             if len(parts) >= 3:
                 content = parts[2].strip()
 
+        style_report_cache.put(model_name, mtime_ns, content)
+        cache_lookups.inc(cache="style_report", result="miss", **labels)
+        style_report_load_duration.observe(time.perf_counter() - started, source="disk", **labels)
         return content
 
-    def _create_actor_prompt(self, style_report: str, input_text: str) -> str:
-        """Create the prompt for text transformation"""
+    def _create_style_prefix(self, style_report: str) -> str:
+        """
+        Create the part of the prompt shared by every request for a style.
+
+        Depends only on the style report, so all single and packed requests for
+        a model start with the same bytes and the provider can serve this
+        prefix from its prompt cache. Anything request-specific goes after it.
+        """
         return f"""You are a text style transformer. Your job is to rewrite text to match a specific style.
 
 STYLE GUIDE:
 {style_report}
 
 INSTRUCTIONS:
-- Transform the input text to match the style described above
+- Transform the input to match the style described above
 - Maintain the core meaning and information
 - Apply the vocabulary, tone, and mannerisms from the style guide
 - Output ONLY the transformed text, nothing else
 
-INPUT TEXT:
+"""
+
+    def _create_actor_prompt(self, style_report: str, input_text: str) -> str:
+        """Create the prompt for text transformation"""
+        return f"""{self._create_style_prefix(style_report)}INPUT TEXT:
 {input_text}
 
 TRANSFORMED TEXT:"""
 
-    def list_models(self) -> list[dict]:
+    def _create_packed_actor_prompt(self, style_report: str, paragraphs: list[str]) -> str:
+        """Create the prompt for transforming several paragraphs in one request"""
+        numbered = "\n\n".join(
+            f"{PACKED_MARKER.format(index=i)}\n{paragraph}"
+            for i, paragraph in enumerate(paragraphs, start=1)
+        )
+        return f"""{self._create_style_prefix(style_report)}PARAGRAPH RULES:
+- The input contains {len(paragraphs)} paragraphs, each preceded by a marker line such as {PACKED_MARKER.format(index=1)}
+- Output exactly {len(paragraphs)} transformed paragraphs, each preceded by its original marker line, in the same order
+- Do not merge, split, skip or add paragraphs
+
+INPUT PARAGRAPHS:
+{numbered}
+
+TRANSFORMED PARAGRAPHS:"""
+
+    def _pack_paragraphs(self, paragraphs: list[str], token_budget: int) -> list[list[str]]:
+        """Group consecutive paragraphs into batches that fit the token budget"""
+        batches = []
+        current = []
+        current_tokens = 0
+
+        for paragraph in paragraphs:
+            tokens = estimate_tokens(paragraph)
+            if current and current_tokens + tokens > token_budget:
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(paragraph)
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+
+        return batches
+
+    def _split_packed_output(self, output: str, expected: int) -> list[str] | None:
         """
-        List all available style models.
+        Split a packed response back into paragraphs.
+
+        Returns None unless the output contains exactly the markers 1..expected,
+        in order, each followed by non-empty text.
+        """
+        matches = list(PACKED_MARKER_PATTERN.finditer(output))
+        if [int(m.group(1)) for m in matches] != list(range(1, expected + 1)):
+            return None
+
+        paragraphs = []
+        for i, match in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(output)
+            text = output[match.end():end].strip()
+            if not text:
+                return None
+            paragraphs.append(text)
+
+        return paragraphs
+
+    def list_models(self, offset: int = 0, limit: int | None = None) -> list[dict]:
+        """
+        List all available style models from the model registry.
+
+        Args:
+            offset: Number of models to skip
+            limit: Maximum number of models to return (None for all)
 
         Returns:
-            list: List of model metadata dictionaries
-        """
-        models = []
-        models_dir = config.MODELS_DIR
-
-        if not os.path.exists(models_dir):
-            return models
-
-        for filename in os.listdir(models_dir):
-            if filename.endswith('.md') and not filename.startswith('temp_'):
-                model_name = filename[:-3]  # Remove .md extension
-                file_path = os.path.join(models_dir, filename)
-
-                # Get file metadata
-                stat_info = os.stat(file_path)
-                created_at = stat_info.st_ctime
-
-                # Try to read metadata from file
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if content.startswith("---"):
-                        # Parse metadata header
-                        parts = content.split("---", 2)
-                        if len(parts) >= 2:
-                            metadata_lines = parts[1].strip().split('\n')
-                            for line in metadata_lines:
-                                if line.startswith('created_at:'):
-                                    # Use metadata timestamp if available
-                                    pass
-
-                models.append({
-                    "name": model_name,
-                    "created_at": created_at,
-                    "file_path": file_path
-                })
-
-        # Sort by creation time (newest first)
-        models.sort(key=lambda x: x["created_at"], reverse=True)
-
-        return models
+            list: List of model metadata dictionaries, newest first
+        """
+        return model_registry.list(offset=offset, limit=limit)
 
     def delete_model(self, model_name: str) -> bool:
         """
@@ -161,4 +505,6 @@ TRANSFORMED TEXT:"""
             raise FileNotFoundError(f"Model '{model_name}' not found")
 
         os.remove(file_path)
+        style_report_cache.invalidate(model_name)
+        model_registry.remove(model_name)
         return True
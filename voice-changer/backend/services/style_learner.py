@@ -1,16 +1,35 @@
 import time
 import os
-from openai import OpenAI
+import re
+import asyncio
+import hashlib
+from openai import AsyncOpenAI
 from config import config
+from services.style_report_cache import style_report_cache
+from services.model_registry import model_registry
+from services.tokens import estimate_tokens
+from services.usage_tracker import usage_tracker
+from services.character_report_store import character_report_store
+from services.character_search_cache import normalize_query
+from services.single_flight import SingleFlight
+from services.llm_scheduler import llm_scheduler
+from services.llm_client import get_llm_client
+
+LEARNER_INSTRUCTIONS = "You are an expert in analyzing writing styles and character voices."
+
+# Bump when the character prompt changes so stored character reports are regenerated
+CHARACTER_PROMPT_VERSION = 1
 
 class StyleLearner:
     """Service for analyzing text corpus and generating style reports"""
 
-    def __init__(self):
-        self.client = OpenAI(api_key=config.OPENAI_API_KEY)
+    def __init__(self, client: AsyncOpenAI | None = None):
+        self.client = client or get_llm_client()
         self.model_name = config.MODEL_NAME
+        # Identical analyses in flight at the same time share one API call
+        self._single_flight = SingleFlight()
 
-    def analyze_corpus(self, corpus: str) -> tuple[str, str]:
+    async def analyze_corpus(self, corpus: str) -> tuple[str, str]:
         """
         Analyze a text corpus and generate a style report.
 
@@ -20,18 +39,14 @@ class StyleLearner:
         Returns:
             tuple: (report_id, style_report)
         """
-        # Create the style analysis prompt
-        prompt = self._create_learner_prompt(corpus)
-
-        # Call OpenAI API using Responses API (for GPT-5)
-        response = self.client.responses.create(
-            model=self.model_name,
-            instructions="You are an expert in analyzing writing styles and character voices.",
-            input=prompt
-        )
+        shards = self._split_corpus(corpus, config.LEARNER_SHARD_TOKENS)
 
-        # Extract the style report
-        style_report = response.output_text
+        if len(shards) == 1:
+            # Create the style analysis prompt
+            style_report = await self._analyze(self._create_learner_prompt(corpus))
+        else:
+            # Corpus is larger than one context: map over shards, then merge
+            style_report = await self._analyze_sharded(shards)
 
         # Generate a temporary report ID
         report_id = f"temp_{int(time.time())}"
@@ -41,10 +56,13 @@ class StyleLearner:
 
         return report_id, style_report
 
-    def analyze_character(self, character_name: str, description: str, source: str) -> tuple[str, str]:
+    async def analyze_character(self, character_name: str, description: str, source: str) -> tuple[str, str]:
         """
         Generate a style report for a famous character using LLM's existing knowledge.
 
+        Reports are kept in the character report store, so repeated previews and
+        trainings of the same (name, source) reuse one analysis until it expires.
+
         Args:
             character_name: The name of the character
             description: Brief description of the character
@@ -53,18 +71,23 @@ class StyleLearner:
         Returns:
             tuple: (report_id, style_report)
         """
-        # Create the character analysis prompt
-        prompt = self._create_character_prompt(character_name, description, source)
-
-        # Call OpenAI API using Responses API (for GPT-5)
-        response = self.client.responses.create(
-            model=self.model_name,
-            instructions="You are an expert in analyzing writing styles and character voices.",
-            input=prompt
-        )
+        fingerprint = f"{self.model_name}:v{CHARACTER_PROMPT_VERSION}"
+
+        async def generate() -> str:
+            stored = await asyncio.to_thread(character_report_store.get, character_name, source, fingerprint)
+            if stored is not None:
+                return stored["style_report"]
+
+            # Create the character analysis prompt
+            prompt = self._create_character_prompt(character_name, description, source)
 
-        # Extract the style report
-        style_report = response.output_text
+            report = await self._analyze(prompt)
+            await asyncio.to_thread(character_report_store.put, character_name, source, fingerprint, report)
+            return report
+
+        # A preview and a training request for the same character share one analysis
+        key = ("character", normalize_query(character_name), normalize_query(source or ""), fingerprint)
+        style_report = await self._single_flight.run(key, generate)
 
         # Generate a temporary report ID
         report_id = f"temp_{int(time.time())}"
@@ -74,6 +97,145 @@ class StyleLearner:
 
         return report_id, style_report
 
+    async def _analyze(self, prompt: str) -> str:
+        """Send an analysis prompt to the model and return the report"""
+        async def call() -> str:
+            # Call OpenAI API using Responses API (for GPT-5)
+            response = await llm_scheduler.run(
+                lambda: self.client.responses.create(
+                    model=self.model_name,
+                    instructions=LEARNER_INSTRUCTIONS,
+                    input=prompt
+                ),
+                estimated_tokens=estimate_tokens(prompt),
+                operation="learner.analyze"
+            )
+            usage_tracker.record("learner.analyze", None, response.usage)
+
+            # Extract the style report
+            return response.output_text
+
+        key = ("analyze", self.model_name, hashlib.sha256(prompt.encode('utf-8')).hexdigest())
+        return await self._single_flight.run(key, call)
+
+    async def _analyze_sharded(self, shards: list[str]) -> str:
+        """
+        Map-reduce style analysis for corpora larger than one prompt.
+
+        Each shard is analyzed concurrently (bounded by LEARNER_CONCURRENCY),
+        then the partial reports are merged. If the partial reports are
+        themselves too large for one merge prompt, they are merged in groups
+        until a single report remains.
+        """
+        semaphore = asyncio.Semaphore(max(1, config.LEARNER_CONCURRENCY))
+
+        async def run(prompt: str) -> str:
+            async with semaphore:
+                return await self._analyze(prompt)
+
+        async def merge(group: list[str]) -> str:
+            if len(group) == 1:
+                return group[0]
+            return await run(self._create_merge_prompt(group))
+
+        # Map
+        reports = await asyncio.gather(*(
+            run(self._create_shard_prompt(shard, i, len(shards)))
+            for i, shard in enumerate(shards, start=1)
+        ))
+
+        # Reduce
+        while len(reports) > 1:
+            groups = self._group_reports(reports, config.LEARNER_SHARD_TOKENS)
+            reports = await asyncio.gather(*(merge(group) for group in groups))
+
+        return reports[0]
+
+    def _split_corpus(self, corpus: str, token_budget: int) -> list[str]:
+        """Split a corpus into shards of at most ~token_budget tokens, on paragraph boundaries"""
+        if estimate_tokens(corpus) <= token_budget:
+            return [corpus]
+
+        max_chars = token_budget * 4
+        pieces = []
+        for paragraph in re.split(r"\n\s*\n", corpus):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            # Paragraphs longer than a shard are cut on sentence ends, then hard-cut
+            while len(paragraph) > max_chars:
+                cut = paragraph.rfind(". ", 0, max_chars)
+                cut = cut + 1 if cut > max_chars // 2 else max_chars
+                pieces.append(paragraph[:cut].strip())
+                paragraph = paragraph[cut:].strip()
+            if paragraph:
+                pieces.append(paragraph)
+
+        shards = []
+        current = []
+        current_tokens = 0
+        for piece in pieces:
+            tokens = estimate_tokens(piece)
+            if current and current_tokens + tokens > token_budget:
+                shards.append("\n\n".join(current))
+                current = []
+                current_tokens = 0
+            current.append(piece)
+            current_tokens += tokens
+
+        if current:
+            shards.append("\n\n".join(current))
+
+        return shards
+
+    def _group_reports(self, reports: list[str], token_budget: int) -> list[list[str]]:
+        """Group partial reports so each merge prompt stays within the token budget"""
+        groups = []
+        current = []
+        current_tokens = 0
+        for report in reports:
+            tokens = estimate_tokens(report)
+            if len(current) >= 2 and current_tokens + tokens > token_budget:
+                groups.append(current)
+                current = []
+                current_tokens = 0
+            current.append(report)
+            current_tokens += tokens
+
+        if current:
+            groups.append(current)
+
+        return groups
+
+    def _create_shard_prompt(self, shard: str, index: int, total: int) -> str:
+        """Create the prompt for analyzing one shard of a large corpus"""
+        return f"""{self._create_learner_prompt(shard)}
+
+Note: this is excerpt {index} of {total} from a larger corpus. Describe the style as it appears in this excerpt; the partial reports will be merged afterwards."""
+
+    def _create_merge_prompt(self, reports: list[str]) -> str:
+        """Create the prompt for merging partial style reports"""
+        sections = "\n\n".join(
+            f"PARTIAL REPORT {i}:\n{report}" for i, report in enumerate(reports, start=1)
+        )
+        return f"""You are an expert in analyzing writing styles and character voices. The following partial style reports were each written from a different excerpt of the same corpus. Merge them into one comprehensive style guide.
+
+Cover the same aspects:
+1. Vocabulary patterns and unique phrases
+2. Sentence structure and rhythm
+3. Tone and emotional patterns
+4. Speaking mannerisms and quirks
+5. Common topics and themes
+6. Catchphrases or recurring elements
+7. Punctuation and formatting patterns
+8. Energy level and enthusiasm
+
+Keep patterns that recur across reports, resolve contradictions in favor of the most consistent evidence, and keep the most representative examples.
+
+{sections}
+
+Generate a detailed style report that can be used to accurately mimic this writing style."""
+
     def _create_learner_prompt(self, corpus: str) -> str:
         """Create the prompt for style analysis"""
         return f"""You are an expert in analyzing writing styles and character voices. Analyze the following text corpus and create a comprehensive style guide.
@@ -164,4 +326,8 @@ created_at: {timestamp}
         # Delete temporary file
         os.remove(temp_path)
 
+        # Drop any cached copy of a model previously saved under this name
+        style_report_cache.invalidate(model_name)
+        model_registry.upsert(model_name)
+
         return True
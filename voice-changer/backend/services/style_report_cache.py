@@ -0,0 +1,60 @@
+from collections import OrderedDict
+from threading import Lock
+from config import config
+
+class StyleReportCache:
+    """Bounded LRU cache of parsed style reports, keyed by model name"""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[int, str]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, model_name: str, mtime_ns: int) -> str | None:
+        """
+        Return the cached style report if it was loaded from the same file version.
+
+        Args:
+            model_name: The name of the style model
+            mtime_ns: Current modification time of the model file
+
+        Returns:
+            str or None: The cached report, or None on a miss or stale entry
+        """
+        with self._lock:
+            entry = self._entries.get(model_name)
+            if entry is None:
+                return None
+
+            cached_mtime, style_report = entry
+            if cached_mtime != mtime_ns:
+                # File changed on disk since it was cached
+                del self._entries[model_name]
+                return None
+
+            self._entries.move_to_end(model_name)
+            return style_report
+
+    def put(self, model_name: str, mtime_ns: int, style_report: str):
+        """Store a parsed style report, evicting the least recently used entry if full"""
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[model_name] = (mtime_ns, style_report)
+            self._entries.move_to_end(model_name)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, model_name: str):
+        """Drop a model from the cache (after it is saved or deleted)"""
+        with self._lock:
+            self._entries.pop(model_name, None)
+
+    def clear(self):
+        """Drop all cached reports"""
+        with self._lock:
+            self._entries.clear()
+
+# Shared by StyleActor (reads) and StyleLearner (writes)
+style_report_cache = StyleReportCache(max_entries=config.STYLE_REPORT_CACHE_SIZE)
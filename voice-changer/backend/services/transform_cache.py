@@ -0,0 +1,192 @@
+import os
+import time
+import asyncio
+import json
+import sqlite3
+import hashlib
+from threading import Lock
+from config import config
+from services.metrics import cache_lookups, current_labels
+
+CACHE_FILENAME = "transform_cache.sqlite3"
+
+# Least-recently-used bookkeeping is batched: reads are remembered in memory
+# and written with the next put, or once this many have accumulated
+TOUCH_BATCH_SIZE = 256
+# Expired / over-limit entries are evicted at most this often, not on every put
+EVICTION_INTERVAL_SECONDS = 60
+
+class TransformCache:
+    """
+    Disk-backed cache of transform results, keyed by a content hash.
+
+    The key covers the LLM model, the style report content (so editing or
+    re-saving a model changes its key) and the input text. Entries expire
+    after `ttl_seconds` and the least recently used entries are evicted once
+    the cache holds more than `max_entries` (checked every
+    EVICTION_INTERVAL_SECONDS, so the cache can briefly run over).
+
+    The methods block on SQLite; call the *_async variants from the event loop.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: int = 7 * 24 * 3600, max_entries: int = 10000):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._conn = None
+        self._lock = Lock()
+        # key -> last read time, not yet written to the database
+        self._touched: dict[str, float] = {}
+        self._last_eviction = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(llm_model: str, style_report: str, input_text: str) -> str:
+        """Content hash identifying one transform request"""
+        report_hash = hashlib.sha256(style_report.encode('utf-8')).hexdigest()
+        payload = json.dumps([llm_model, report_hash, input_text], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Return a cached transform result, or None on a miss or expired entry"""
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: list[str]) -> list[str | None]:
+        """Look up several transform results in one query (None for misses and expired entries)"""
+        if not self.enabled or not keys:
+            return [None] * len(keys)
+
+        now = time.time()
+        found = {}
+        with self._lock:
+            conn = self._connect()
+            unique = list(dict.fromkeys(keys))
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT key, value, created_at FROM results WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                found.update({key: value for key, value, created_at in rows if now - created_at <= self.ttl_seconds})
+
+            for key in found:
+                self._touched[key] = now
+            if len(self._touched) >= TOUCH_BATCH_SIZE:
+                self._flush_touches(conn)
+                conn.commit()
+
+            hits = sum(1 for key in keys if key in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+
+        labels = current_labels()
+        if hits:
+            cache_lookups.inc(hits, cache="transform", result="hit", **labels)
+        if len(keys) > hits:
+            cache_lookups.inc(len(keys) - hits, cache="transform", result="miss", **labels)
+        return [found.get(key) for key in keys]
+
+    def put(self, key: str, value: str):
+        """Store a transform result (expired / least recently used entries are evicted periodically)"""
+        if not self.enabled:
+            return
+
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._touched.pop(key, None)
+            self._flush_touches(conn)
+            if now - self._last_eviction >= EVICTION_INTERVAL_SECONDS:
+                self._evict(conn, now)
+            conn.commit()
+
+    async def get_async(self, key: str) -> str | None:
+        """get() in a worker thread"""
+        return await asyncio.to_thread(self.get, key)
+
+    async def get_many_async(self, keys: list[str]) -> list[str | None]:
+        """get_many() in a worker thread"""
+        return await asyncio.to_thread(self.get_many, keys)
+
+    async def put_async(self, key: str, value: str):
+        """put() in a worker thread"""
+        await asyncio.to_thread(self.put, key, value)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        entries = 0
+        if self.enabled:
+            with self._lock:
+                entries = self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+    def _flush_touches(self, conn: sqlite3.Connection):
+        """Write the batched last-access times (caller holds the lock and commits)"""
+        if self._touched:
+            conn.executemany(
+                "UPDATE results SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Drop expired entries, then the least recently used ones over max_entries (lock held)"""
+        self._last_eviction = now
+        expired = conn.execute(
+            "DELETE FROM results WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+
+        overflow = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY last_access ASC LIMIT ?)",
+                (overflow,)
+            )
+        self.evictions += max(expired, 0) + max(overflow, 0)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (caller holds the lock)"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Losing the last few cached results on power loss is harmless; skip the fsync per commit
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_last_access ON results (last_access)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_created_at ON results (created_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+transform_cache = TransformCache(
+    os.path.join(config.MODELS_DIR, CACHE_FILENAME),
+    ttl_seconds=config.TRANSFORM_CACHE_TTL_SECONDS,
+    max_entries=config.TRANSFORM_CACHE_MAX_ENTRIES
+)
@@ -0,0 +1,79 @@
+import os
+import asyncio
+import hashlib
+import tempfile
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload crosses the size limit while it is being spooled"""
+
+class SpooledUpload:
+    """
+    An uploaded file spooled to a temporary file on disk.
+
+    Holds the path workers open the file by, its size and the SHA-256 of its
+    bytes (computed while spooling). The temporary file is removed by
+    close(), or on leaving an `async with` block.
+    """
+
+    def __init__(self, path: str, size: int, sha256: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    def close(self):
+        """Delete the temporary file (safe to call more than once)"""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    async def __aenter__(self) -> "SpooledUpload":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+def _copy_to_temp_file(source, max_bytes: int, suffix: str) -> SpooledUpload:
+    """Copy a binary file object to a new temporary file, hashing it (blocking)"""
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            source.seek(0)
+            while chunk := source.read(UPLOAD_CHUNK_BYTES):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                tmp.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+
+    return SpooledUpload(path, size, digest.hexdigest())
+
+async def spool_upload(upload, max_bytes: int, suffix: str = ".pdf") -> SpooledUpload:
+    """
+    Copy an upload to a temporary file in chunks, hashing it on the way.
+
+    The copy runs in a thread so disk I/O and hashing stay off the event
+    loop. Only one chunk is held in memory at a time, and copying stops as
+    soon as the upload crosses `max_bytes`. The copy outlives the request
+    (the form parser's own spooled file is closed when the request ends), so
+    queued jobs can still read it.
+
+    Args:
+        upload: Object with a binary `file` attribute (e.g. UploadFile)
+        max_bytes: Size limit in bytes
+        suffix: Temporary file suffix
+
+    Returns:
+        SpooledUpload: The caller must close() it
+
+    Raises:
+        UploadTooLargeError: If the upload is larger than max_bytes
+    """
+    return await asyncio.to_thread(_copy_to_temp_file, upload.file, max_bytes, suffix)
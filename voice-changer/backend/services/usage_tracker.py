@@ -0,0 +1,84 @@
+from threading import Lock
+from services.metrics import llm_tokens, current_labels
+
+class UsageTracker:
+    """
+    Aggregates LLM token usage per (operation, model).
+
+    Records cached vs uncached input tokens reported by the provider so the
+    effect of prompt caching can be verified under load.
+    """
+
+    def __init__(self):
+        self._totals: dict[tuple[str, str], dict] = {}
+        self._lock = Lock()
+
+    def record(self, operation: str, model_name: str | None, usage) -> dict | None:
+        """
+        Record the usage field of a Responses API or Chat Completions response.
+
+        Args:
+            operation: Service method label, e.g. "actor.transform"
+            model_name: Style model (or other subject) the call was made for
+            usage: The response's usage object (may be None)
+
+        Returns:
+            dict or None: The normalized usage of this request
+        """
+        if usage is None:
+            return None
+
+        # Responses API uses input/output_tokens, Chat Completions prompt/completion_tokens
+        input_tokens = getattr(usage, "input_tokens", None)
+        if input_tokens is None:
+            input_tokens = getattr(usage, "prompt_tokens", 0) or 0
+            details = getattr(usage, "prompt_tokens_details", None)
+            output_tokens = getattr(usage, "completion_tokens", 0) or 0
+        else:
+            details = getattr(usage, "input_tokens_details", None)
+            output_tokens = getattr(usage, "output_tokens", 0) or 0
+        cached_tokens = (getattr(details, "cached_tokens", 0) or 0) if details else 0
+
+        request_usage = {
+            "input_tokens": input_tokens,
+            "cached_input_tokens": cached_tokens,
+            "uncached_input_tokens": input_tokens - cached_tokens,
+            "output_tokens": output_tokens
+        }
+
+        service, _, method = operation.partition(".")
+        labels = current_labels(model_name)
+        llm_tokens.inc(cached_tokens, service=service, method=method, type="cached_input", **labels)
+        llm_tokens.inc(input_tokens - cached_tokens, service=service, method=method, type="uncached_input", **labels)
+        llm_tokens.inc(output_tokens, service=service, method=method, type="output", **labels)
+
+        key = (operation, model_name or "")
+        with self._lock:
+            totals = self._totals.setdefault(key, {
+                "requests": 0,
+                "input_tokens": 0,
+                "cached_input_tokens": 0,
+                "uncached_input_tokens": 0,
+                "output_tokens": 0
+            })
+            totals["requests"] += 1
+            for field, value in request_usage.items():
+                totals[field] += value
+
+        return request_usage
+
+    def stats(self) -> list[dict]:
+        """Usage totals per (operation, model), with the cached share of input tokens"""
+        with self._lock:
+            items = [(key, dict(totals)) for key, totals in self._totals.items()]
+
+        result = []
+        for (operation, model_name), totals in sorted(items):
+            totals["cached_input_ratio"] = (
+                round(totals["cached_input_tokens"] / totals["input_tokens"], 4)
+                if totals["input_tokens"] else 0.0
+            )
+            result.append({"operation": operation, "model_name": model_name or None, **totals})
+        return result
+
+usage_tracker = UsageTracker()
@@ -2,6 +2,9 @@ import axios from 'axios';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
+// Keep in sync with the backend's PDF_MAX_FILE_SIZE_MB
+export const PDF_MAX_SIZE_MB = Number(import.meta.env.VITE_PDF_MAX_SIZE_MB) || 50;
+
 const apiClient = axios.create({
   baseURL: API_BASE_URL,
   headers: {
@@ -56,6 +59,81 @@ export const transformText = async (modelName, text) => {
   return response.data;
 };
 
+/**
+ * Transform text using a trained model, streaming the result as it is generated
+ * @param {string} modelName - The name of the model to use
+ * @param {string} text - The text to transform
+ * @param {(delta: string, textSoFar: string) => void} onDelta - Called for each streamed chunk
+ * @param {AbortSignal} [signal] - Aborts the request; no further chunks are delivered once aborted
+ * @returns {Promise<{transformed_text: string}>}
+ */
+export const streamTransformText = async (modelName, text, onDelta, signal) => {
+  const response = await fetch(`${API_BASE_URL}/api/transform-stream`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      Accept: 'text/event-stream',
+    },
+    body: JSON.stringify({ model_name: modelName, text }),
+    signal,
+  });
+
+  if (!response.ok) {
+    let detail = 'Failed to transform. Please try again.';
+    try {
+      detail = (await response.json()).detail || detail;
+    } catch {}
+    // Match the axios error shape used by the other helpers
+    const error = new Error(detail);
+    error.response = { status: response.status, data: { detail } };
+    throw error;
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let textSoFar = '';
+
+  // SSE messages are separated by a blank line
+  const handleMessage = (message) => {
+    let event = 'message';
+    let data = '';
+    for (const line of message.split('\n')) {
+      if (line.startsWith('event:')) event = line.slice(6).trim();
+      else if (line.startsWith('data:')) data += line.slice(5).trim();
+    }
+    if (!data) return null;
+
+    const payload = JSON.parse(data);
+    if (event === 'error') {
+      const error = new Error(payload.detail);
+      error.response = { data: payload };
+      throw error;
+    }
+    if (event === 'done') return payload;
+
+    textSoFar += payload.delta;
+    if (!signal?.aborted) onDelta?.(payload.delta, textSoFar);
+    return null;
+  };
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const message = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      const result = handleMessage(message);
+      if (result) return result;
+    }
+  }
+
+  return { transformed_text: textSoFar.trim() };
+};
+
 /**
  * Delete a trained model
  * @param {string} modelName - The name of the model to delete
@@ -85,6 +163,35 @@ export const extractPdf = async (file) => {
   return response.data;
 };
 
+// Background jobs: long PDF work is queued and polled so requests never
+// outlive load-balancer timeouts.
+
+const JOB_POLL_INTERVAL_MS = 1000;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+/**
+ * Poll a background job until it finishes
+ * @param {string} jobId - The job id returned when the job was submitted
+ * @param {(progress: {done: number, total: number}) => void} [onProgress] - Progress callback
+ * @returns {Promise<object>} - The final job status
+ */
+export const waitForJob = async (jobId, onProgress) => {
+  while (true) {
+    const response = await apiClient.get(`/api/jobs/${jobId}`);
+    const job = response.data;
+    onProgress?.(job.progress);
+
+    if (job.status === 'completed') return job;
+    if (job.status === 'failed') {
+      const error = new Error(job.error);
+      error.response = { data: { detail: job.error } };
+      throw error;
+    }
+    await sleep(JOB_POLL_INTERVAL_MS);
+  }
+};
+
 /**
  * Train a model from a PDF file
  * @param {File} file - The PDF file to use as corpus
@@ -94,11 +201,14 @@ export const trainModelFromPdf = async (file) => {
   const formData = new FormData();
   formData.append('file', file);
 
-  const response = await axios.post(`${API_BASE_URL}/api/train-pdf`, formData, {
+  const submitted = await axios.post(`${API_BASE_URL}/api/jobs/train-pdf`, formData, {
     headers: {
       'Content-Type': 'multipart/form-data',
     },
   });
+  await waitForJob(submitted.data.job_id);
+
+  const response = await apiClient.get(`/api/jobs/${submitted.data.job_id}/result`);
   return response.data;
 };
 
@@ -107,30 +217,26 @@ export const trainModelFromPdf = async (file) => {
  * @param {File} file - The PDF file to transform
  * @param {string} modelName - The name of the model to use
  * @param {string} outputFormat - "text" or "pdf"
+ * @param {(progress: {done: number, total: number}) => void} [onProgress] - Paragraph progress callback
  * @returns {Promise<any>} - Text object or Blob for PDF
  */
-export const transformPdf = async (file, modelName, outputFormat = 'text') => {
+export const transformPdf = async (file, modelName, outputFormat = 'text', onProgress) => {
   const formData = new FormData();
   formData.append('file', file);
   formData.append('model_name', modelName);
   formData.append('output_format', outputFormat);
 
-  if (outputFormat === 'pdf') {
-    const response = await axios.post(`${API_BASE_URL}/api/transform-pdf`, formData, {
-      headers: {
-        'Content-Type': 'multipart/form-data',
-      },
-      responseType: 'blob',
-    });
-    return response.data;
-  } else {
-    const response = await axios.post(`${API_BASE_URL}/api/transform-pdf`, formData, {
-      headers: {
-        'Content-Type': 'multipart/form-data',
-      },
-    });
-    return response.data;
-  }
+  const submitted = await axios.post(`${API_BASE_URL}/api/jobs/transform-pdf`, formData, {
+    headers: {
+      'Content-Type': 'multipart/form-data',
+    },
+  });
+  await waitForJob(submitted.data.job_id, onProgress);
+
+  const response = await apiClient.get(`/api/jobs/${submitted.data.job_id}/result`, {
+    responseType: outputFormat === 'pdf' ? 'blob' : 'json',
+  });
+  return response.data;
 };
 
 // Character-related functions
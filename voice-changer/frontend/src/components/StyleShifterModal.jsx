@@ -12,6 +12,7 @@ import {
   transformText,
   transformPdf,
   extractPdf,
+  PDF_MAX_SIZE_MB,
 } from '../api/client';
 
 // Category icons mapping (same as TrainPage)
@@ -304,7 +305,7 @@ const StyleShifterModal = ({ isOpen, onClose, onModelsUpdated }) => {
               <FileUploadZone
                 onFileSelect={handlePdfFileSelect}
                 accept=".pdf"
-                maxSizeMB={10}
+                maxSizeMB={PDF_MAX_SIZE_MB}
                 disabled={isTraining || isExtractingPdf}
               />
               {isExtractingPdf && (
@@ -463,7 +464,7 @@ const StyleShifterModal = ({ isOpen, onClose, onModelsUpdated }) => {
             <textarea className="textarea-field h-40" placeholder="Enter text to transform…" value={testInput} onChange={(e) => setTestInput(e.target.value)} />
           ) : (
             <div>
-              <FileUploadZone onFileSelect={setTestPdfFile} accept=".pdf" maxSizeMB={10} />
+              <FileUploadZone onFileSelect={setTestPdfFile} accept=".pdf" maxSizeMB={PDF_MAX_SIZE_MB} />
               {testPdfFile && (
                 <div className="mt-3">
                   <div className="text-sm font-semibold text-gray-700 mb-2">Output Format</div>
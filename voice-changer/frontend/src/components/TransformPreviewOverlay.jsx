@@ -1,4 +1,4 @@
-const TransformPreviewOverlay = ({ originalText, transformedText, modelName, onApply, onCancel }) => {
+const TransformPreviewOverlay = ({ originalText, transformedText, modelName, onApply, onCancel, isStreaming = false }) => {
   if (!transformedText) return null;
 
   return (
@@ -20,7 +20,7 @@ const TransformPreviewOverlay = ({ originalText, transformedText, modelName, onA
           </div>
           <div className="flex gap-2 justify-end">
             <button onClick={onCancel} className="btn-secondary">Cancel</button>
-            <button onClick={onApply} className="btn-primary">Apply</button>
+            <button onClick={onApply} className="btn-primary" disabled={isStreaming}>Apply</button>
           </div>
         </div>
       </div>
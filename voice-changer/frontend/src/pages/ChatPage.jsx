@@ -1,8 +1,8 @@
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import ChatHeader from '../components/ChatHeader';
 import MessageArea from '../components/MessageArea';
 import InputBar from '../components/InputBar';
-import { getModels, transformText, deleteModel as apiDeleteModel } from '../api/client';
+import { getModels, streamTransformText, deleteModel as apiDeleteModel } from '../api/client';
 import PinnedModelsManager from '../components/PinnedModelsManager';
 import TransformPreviewOverlay from '../components/TransformPreviewOverlay';
 import StyleShifterModal from '../components/StyleShifterModal';
@@ -21,6 +21,7 @@ const ChatPage = () => {
   const [previewText, setPreviewText] = useState('');
   const [pendingMessage, setPendingMessage] = useState('');
   const [showStyleShifter, setShowStyleShifter] = useState(false);
+  const previewAbortRef = useRef(null);
 
   useEffect(() => {
     const load = async () => {
@@ -58,10 +59,17 @@ const ChatPage = () => {
     try {
       const useTransform = !!selectedModel;
       if (useTransform) {
-        // Generate preview first; do not send yet
-        const result = await transformText(selectedModel, text);
-        setPreviewText(result.transformed_text || '');
+        // Generate preview first; do not send yet. The preview fills in as tokens stream.
         setPendingMessage(text);
+        previewAbortRef.current?.abort();
+        const controller = new AbortController();
+        previewAbortRef.current = controller;
+        const result = await streamTransformText(selectedModel, text, (_, textSoFar) => {
+          setPreviewText(textSoFar);
+        }, controller.signal);
+        // The preview was cancelled while the result was arriving
+        if (controller.signal.aborted) return;
+        setPreviewText(result.transformed_text || '');
         // keep input unchanged for cancel path
       } else {
         // Send directly
@@ -103,7 +111,9 @@ const ChatPage = () => {
   };
 
   const handleCancelPreview = () => {
-    // Restore original input and close preview
+    // Stop a preview that is still streaming, restore original input and close preview
+    previewAbortRef.current?.abort();
+    previewAbortRef.current = null;
     setInputValue(pendingMessage);
     setPreviewText('');
     setPendingMessage('');
@@ -144,6 +154,7 @@ const ChatPage = () => {
           modelName={selectedModel || 'Model'}
           onApply={handleApplyPreview}
           onCancel={handleCancelPreview}
+          isStreaming={isSending}
         />
       )}
 
@@ -1,6 +1,6 @@
 import { useState, useCallback } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { trainModel, saveModel, trainModelFromPdf, extractPdf, searchCharacters, getTrainingExamples, getCharacterPreview } from '../api/client';
+import { trainModel, saveModel, trainModelFromPdf, extractPdf, searchCharacters, getTrainingExamples, getCharacterPreview, PDF_MAX_SIZE_MB } from '../api/client';
 import FileUploadZone from '../components/FileUploadZone';
 import TrainingPreview from '../components/TrainingPreview';
 
@@ -238,7 +238,7 @@ const TrainPage = () => {
               <FileUploadZone
                 onFileSelect={handlePdfFileSelect}
                 accept=".pdf"
-                maxSizeMB={10}
+                maxSizeMB={PDF_MAX_SIZE_MB}
                 disabled={isTraining || isExtracting}
               />
 
@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import { getModels, transformText, deleteModel, transformPdf } from '../api/client';
+import { getModels, streamTransformText, deleteModel, transformPdf, PDF_MAX_SIZE_MB } from '../api/client';
 import FileUploadZone from '../components/FileUploadZone';
 
 const TransformPage = () => {
@@ -15,6 +15,7 @@ const TransformPage = () => {
   const [showDeleteConfirm, setShowDeleteConfirm] = useState(false);
   const [error, setError] = useState(null);
   const [copied, setCopied] = useState(false);
+  const [pdfProgress, setPdfProgress] = useState(null); // { done, total } while a PDF job runs
 
   useEffect(() => {
     loadModels();
@@ -52,13 +53,16 @@ const TransformPage = () => {
 
     try {
       if (activeTab === 'text') {
-        const result = await transformText(selectedModel, inputText);
+        // Render tokens as they arrive
+        const result = await streamTransformText(selectedModel, inputText, (_, textSoFar) => {
+          setOutputText(textSoFar);
+        });
         setOutputText(result.transformed_text);
       } else {
         // PDF mode
         if (outputFormat === 'pdf') {
           // Download PDF
-          const pdfBlob = await transformPdf(pdfFile, selectedModel, 'pdf');
+          const pdfBlob = await transformPdf(pdfFile, selectedModel, 'pdf', setPdfProgress);
           const url = window.URL.createObjectURL(pdfBlob);
           const a = document.createElement('a');
           a.href = url;
@@ -70,7 +74,7 @@ const TransformPage = () => {
           setOutputText('PDF downloaded successfully!');
         } else {
           // Show as text
-          const result = await transformPdf(pdfFile, selectedModel, 'text');
+          const result = await transformPdf(pdfFile, selectedModel, 'text', setPdfProgress);
           setOutputText(result.transformed_text);
         }
       }
@@ -78,6 +82,7 @@ const TransformPage = () => {
       setError(err.response?.data?.detail || 'Failed to transform. Please try again.');
     } finally {
       setIsLoading(false);
+      setPdfProgress(null);
     }
   };
 
@@ -248,7 +253,7 @@ const TransformPage = () => {
                 <FileUploadZone
                   onFileSelect={handlePdfFileSelect}
                   accept=".pdf"
-                  maxSizeMB={10}
+                  maxSizeMB={PDF_MAX_SIZE_MB}
                   disabled={isLoading}
                 />
                 {pdfFile && (
@@ -309,7 +314,9 @@ const TransformPage = () => {
                       d="M4 12a8 8 0 018-8V0C5.373 0 0 5.373 0 12h4zm2 5.291A7.962 7.962 0 014 12H0c0 3.042 1.135 5.824 3 7.938l3-2.647z"
                     />
                   </svg>
-                  Transforming...
+                  {pdfProgress?.total
+                    ? `Transforming... ${pdfProgress.done}/${pdfProgress.total} paragraphs`
+                    : 'Transforming...'}
                 </span>
               ) : (
                 <span className="flex items-center justify-center">